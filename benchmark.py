@@ -0,0 +1,223 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from voronoi_cells import ENGINES, generate_seed_points
+from voronoi_to_delauney import generate_quadrants, cell_conversion
+
+
+# scaling benchmark for every distribution x bounding shape x N x stage.
+# each stage is timed on its own, fed with the output of the stage before it.
+#
+#   python benchmark.py --output results.json
+#   python benchmark.py --baseline results.json   # exits 1 when a stage got slower
+#   python benchmark.py --stages cells --workers 1 4 16   # process pool speedups
+
+
+DISTRIBUTIONS = ("halton", "fibonacci", "fibonacci_segments", "poisson", "random")
+SHAPES = ("rectangle", "circle", "triangle", "custom")
+SIZES = (100, 1000, 10000, 100000)
+STAGES = ("points", "cells", "format", "quadrants", "delauney")
+WORKERS = (1,)
+
+
+def area(n):
+    """Square side for n seeds at constant density, roomy enough for poisson's default min_dist."""
+    return 40 * math.sqrt(n)
+
+
+def custom_shape(side):
+    """Hexagon around a side x side square centred on the origin."""
+    r = side * 0.75
+    return [(r * math.cos(math.pi * i / 3), r * math.sin(math.pi * i / 3)) for i in range(6)]
+
+
+def measure(function, repeat):
+    """Run function repeat times, return (result, best wall time, peak traced memory of one extra run)."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+
+    # memory is traced on its own run, tracemalloc slows the timed runs down
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def stage_functions(distribution, shape, n, engine, seed, workers=1):
+    """The stages of one case as (name, function of the previous stage's result), cells computed with `workers` processes."""
+    side = area(n)
+    outline = custom_shape(side) if shape == "custom" else None
+
+    def points(_):
+        return generate_seed_points(side, side, n, -side / 2, -side / 2, distribution, seed)
+
+    def cells(seed_points):
+        voronoi = ENGINES[engine](seed_points, bounding_shape=shape, custom_shape=outline)
+        return voronoi, seed_points, voronoi.voronoi_cells(workers=workers)
+
+    def to_list(previous):
+        voronoi, seed_points, cells_dict = previous
+        return voronoi.dictionary_to_list(cells_dict), seed_points
+
+    def quadrants(previous):
+        voronoi_data, seed_points = previous
+        return voronoi_data, seed_points, generate_quadrants(voronoi_data)
+
+    def delauney(previous):
+        voronoi_data, seed_points, quadrant_data = previous
+        return cell_conversion(voronoi_data, quadrant_data, seed_points).return_delauney_points()
+
+    return [("points", points), ("cells", cells), ("format", to_list),
+            ("quadrants", quadrants), ("delauney", delauney)]
+
+
+def fit_exponent(samples):
+    """Least squares slope of log(seconds) against log(n), None with fewer than two sizes."""
+    samples = [(n, seconds) for n, seconds in samples if seconds > 0]
+    if len(samples) < 2:
+        return None
+    x = np.log([n for n, _ in samples])
+    y = np.log([seconds for _, seconds in samples])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def extrapolate(samples, n):
+    """Expected seconds at n from the measured samples (quadratic growth until two sizes are known)."""
+    last_n, last_seconds = samples[-1]
+    exponent = fit_exponent(samples)
+    return last_seconds * (n / last_n) ** (2.0 if exponent is None else max(exponent, 1.0))
+
+
+def run(distributions, shapes, sizes, engine="clip", repeat=1, max_seconds=60.0, seed=0, log=print,
+        workers=WORKERS, stages=STAGES):
+    """
+    Run every case and return the results dict that is written to JSON.
+
+    Every case is run once per entry of workers (processes for the cells stage).
+    Stages after the last one in `stages` are not run.
+    """
+    last_stage = max(STAGES.index(stage) for stage in stages)
+    cases, skipped = [], []
+    for distribution in distributions:
+        for shape in shapes:
+            for pool in workers:
+                history = {stage: [] for stage in STAGES}  # (n, seconds) per stage, for extrapolation
+                for n in sorted(sizes):
+                    result = None
+                    for stage, function in stage_functions(distribution, shape, n, engine, seed, pool)[:last_stage + 1]:
+                        samples = history[stage]
+                        if samples and extrapolate(samples, n) > max_seconds:
+                            skipped.append({"distribution": distribution, "shape": shape, "stage": stage, "n": n,
+                                            "workers": pool, "expected_seconds": extrapolate(samples, n)})
+                            log(f"skip {distribution:18} {shape:9} {stage:9} n={n} workers={pool} "
+                                f"(expected {extrapolate(samples, n):.0f}s)")
+                            break  # later stages need this stage's output
+
+                        result, seconds, peak = measure(lambda: function(result), repeat)
+                        samples.append((n, seconds))
+                        cases.append({"distribution": distribution, "shape": shape, "stage": stage, "n": n,
+                                      "workers": pool, "seconds": seconds, "peak_bytes": peak})
+                        log(f"{distribution:18} {shape:9} {stage:9} n={n:<7} workers={pool:<3} "
+                            f"{seconds:9.4f}s {peak / 2 ** 20:8.1f}MB")
+
+    # scaling exponent per distribution, shape, stage and worker count
+    exponents = []
+    groups = {}
+    for case in cases:
+        key = (case["distribution"], case["shape"], case["stage"], case["workers"])
+        groups.setdefault(key, []).append((case["n"], case["seconds"]))
+    for (distribution, shape, stage, pool), samples in groups.items():
+        exponent = fit_exponent(samples)
+        if exponent is not None:
+            exponents.append({"distribution": distribution, "shape": shape, "stage": stage, "workers": pool,
+                              "exponent": exponent})
+
+    return {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__, "engine": engine,
+                 "repeat": repeat, "seed": seed, "max_seconds": max_seconds, "cpus": os.cpu_count()},
+        "cases": cases,
+        "exponents": exponents,
+        "speedups": speedups(cases),
+        "skipped": skipped,
+    }
+
+
+def speedups(cases):
+    """Cells stage time with one worker divided by the time with each other worker count, per case."""
+    key = lambda case: (case["distribution"], case["shape"], case["n"])
+    serial = {key(case): case["seconds"] for case in cases if case["stage"] == "cells" and case["workers"] == 1}
+    return [{"distribution": case["distribution"], "shape": case["shape"], "n": case["n"], "workers": case["workers"],
+             "speedup": serial[key(case)] / case["seconds"]}
+            for case in cases
+            if case["stage"] == "cells" and case["workers"] != 1 and key(case) in serial and case["seconds"] > 0]
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.005):
+    """Cases that got more than `tolerance` slower than in the baseline (ignoring times under min_seconds)."""
+    key = lambda case: (case["distribution"], case["shape"], case["stage"], case["n"], case.get("workers", 1))
+    previous = {key(case): case["seconds"] for case in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        before = previous.get(key(case))
+        if before is None or max(before, case["seconds"]) < min_seconds:
+            continue
+        if case["seconds"] > before * (1 + tolerance):
+            regressions.append(dict(case, baseline_seconds=before, slowdown=case["seconds"] / before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmark for the voronoi and delauney stages.")
+    parser.add_argument("--distributions", nargs="+", default=DISTRIBUTIONS, choices=DISTRIBUTIONS)
+    parser.add_argument("--shapes", nargs="+", default=SHAPES, choices=SHAPES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES,
+                        help="run the stages up to the last one given")
+    parser.add_argument("--engine", default="clip", choices=sorted(ENGINES))
+    parser.add_argument("--workers", nargs="+", type=int, default=WORKERS,
+                        help="process counts for the cells stage, speedups are reported against 1")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per case, the best is kept")
+    parser.add_argument("--max-seconds", type=float, default=60.0, help="skip cases expected to take longer")
+    parser.add_argument("--seed", type=int, default=0, help="rng seed for the random and poisson distributions")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against, exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.distributions, args.shapes, args.sizes, args.engine, args.repeat, args.max_seconds, args.seed,
+                  workers=args.workers, stages=args.stages)
+
+    for entry in results["exponents"]:
+        print(f"{entry['distribution']:18} {entry['shape']:9} {entry['stage']:9} workers={entry['workers']:<3} "
+              f"~ N^{entry['exponent']:.2f}")
+    for entry in results["speedups"]:
+        print(f"{entry['distribution']:18} {entry['shape']:9} n={entry['n']:<7} workers={entry['workers']:<3} "
+              f"speedup {entry['speedup']:.2f}x")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for case in regressions:
+            print(f"REGRESSION {case['distribution']} {case['shape']} {case['stage']} n={case['n']}: "
+                  f"{case['baseline_seconds']:.4f}s -> {case['seconds']:.4f}s ({case['slowdown']:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
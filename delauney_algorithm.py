@@ -0,0 +1,419 @@
+import math
+import numpy as np
+from voronoi_algorithm import VoronoiGenerator
+from voronoi_diagram import polygon_centroids
+
+
+# calculate the delauney triangulation directly from the seed points (bowyer-watson)
+# and derive the voronoi cells from it, rather than going voronoi -> quadrants -> delauney
+
+
+def orientation(a, b, c):
+    """Twice the signed area of triangle abc, positive when counter-clockwise."""
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def in_circumcircle(a, b, c, d):
+    """Positive when d lies inside the circumcircle of the counter-clockwise triangle abc."""
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) -
+            (bdx * bdx + bdy * bdy) * (adx * cdy - cdx * ady) +
+            (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def plane_point(p):
+    """Point p as the (x, y) float tuple the triangulation stores."""
+    return (float(p[0]), float(p[1]))
+
+
+class DelauneyTriangulation:
+    """
+    Incremental Bowyer-Watson delauney triangulation.
+
+    Vertices 0, 1 and 2 form a super triangle far outside the given extent so
+    every inserted point lies inside the triangulation. Triangles are stored by
+    id as counter-clockwise vertex triples, with adjacent[t][i] holding the
+    triangle across the edge opposite vertex i (None outside the super triangle).
+    Points are located by walking across edges from the last touched triangle.
+    """
+
+    # distance of the super triangle vertices in multiples of the extent
+    super_scale = 100
+
+    # geometry of the points, replaced by SphericalTriangulation
+    orientation = staticmethod(orientation)
+    in_circumcircle = staticmethod(in_circumcircle)
+    as_point = staticmethod(plane_point)
+
+    def __init__(self, extent_points):
+        xs, ys = [p[0] for p in extent_points], [p[1] for p in extent_points]
+        cx, cy = (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+        d = max(max(xs) - min(xs), max(ys) - min(ys), 1.0) * self.super_scale
+
+        self.points = [(cx - d, cy - d), (cx + d, cy - d), (cx, cy + d)]
+        self.triangles = {0: [0, 1, 2]}
+        self.adjacent = {0: [None, None, None]}
+        self.vertex_triangle = [0, 0, 0]
+        self.next_triangle = 1
+        self.last = 0
+        self.walk_turn = 0
+
+
+    def is_super(self, v):
+        """True for the three super triangle vertices."""
+        return v < 3
+
+
+    def add_triangle(self, vertices):
+        """Store a new counter-clockwise triangle and return its id."""
+        t = self.next_triangle
+        self.next_triangle += 1
+        self.triangles[t] = vertices
+        self.adjacent[t] = [None, None, None]
+        for v in vertices:
+            self.vertex_triangle[v] = t
+        self.last = t
+        return t
+
+
+    def link(self, t, a, b, n):
+        """Point the edge (a, b) of triangle t at neighbour n and, if present, n's twin edge back at t."""
+        vertices = self.triangles[t]
+        self.adjacent[t][3 - vertices.index(a) - vertices.index(b)] = n
+        if n is not None:
+            neighbour = self.triangles[n]
+            self.adjacent[n][3 - neighbour.index(a) - neighbour.index(b)] = t
+
+
+    def locate(self, p):
+        """Walk from the last touched triangle to a triangle containing p."""
+        t = self.last if self.last in self.triangles else next(iter(self.triangles))
+        while True:
+            vertices = self.triangles[t]
+            # rotate the first edge tested so the walk cannot cycle on degenerate input
+            self.walk_turn = (self.walk_turn + 1) % 3
+            for k in range(3):
+                i = (self.walk_turn + k) % 3
+                a, b = self.points[vertices[(i + 1) % 3]], self.points[vertices[(i + 2) % 3]]
+                if self.orientation(a, b, p) < 0:
+                    t = self.adjacent[t][i]
+                    if t is None:
+                        raise ValueError(f"Point {p} lies outside the triangulation.")
+                    break
+            else:
+                return t
+
+
+    def insert(self, p, v=None):
+        """
+        Insert point p and return its vertex id.
+
+        A point already in the triangulation returns the existing vertex id.
+        A removed vertex id may be passed as v to reuse it.
+        """
+        p = self.as_point(p)
+        start = self.locate(p)
+        for u in self.triangles[start]:
+            if self.points[u] == p:
+                return u
+
+        if v is None:
+            v = len(self.points)
+            self.points.append(p)
+            self.vertex_triangle.append(None)
+        else:
+            self.points[v] = p
+
+        # cavity: every triangle whose circumcircle contains p, grown from the containing triangle
+        cavity, stack = set(), [start]
+        while stack:
+            t = stack.pop()
+            if t in cavity:
+                continue
+            cavity.add(t)
+            for n in self.adjacent[t]:
+                if n is not None and n not in cavity:
+                    a, b, c = (self.points[u] for u in self.triangles[n])
+                    if self.in_circumcircle(a, b, c, p) > 0:
+                        stack.append(n)
+
+        # cavity boundary edges, counter-clockwise, with the triangle outside each one
+        boundary = []
+        for t in cavity:
+            vertices = self.triangles[t]
+            for i in range(3):
+                n = self.adjacent[t][i]
+                if n not in cavity:
+                    boundary.append((vertices[(i + 1) % 3], vertices[(i + 2) % 3], n))
+
+        for t in cavity:
+            del self.triangles[t]
+            del self.adjacent[t]
+
+        # fan the cavity from p
+        starts, ends = {}, {}
+        for a, b, n in boundary:
+            t = self.add_triangle([v, a, b])
+            self.link(t, a, b, n)
+            starts[a], ends[b] = t, t
+        for a, t in starts.items():
+            self.adjacent[t][2] = ends[a]
+            self.adjacent[t][1] = starts[self.triangles[t][2]]
+        return v
+
+
+    def remove(self, v):
+        """
+        Remove vertex v and retriangulate the hole it leaves.
+
+        The hole is the polygon of v's neighbours, filled by clipping ears whose
+        circumcircle holds no other polygon vertex, so the result is still delauney.
+        Returns the ids of the new triangles.
+        """
+        polygon, outside = [], {}
+        for u, t in self.ring(v):
+            vertices = self.triangles[t]
+            i = vertices.index(v)
+            w = vertices[(i + 2) % 3]
+            polygon.append(u)
+            outside[(u, w)] = self.adjacent[t][i]
+            del self.triangles[t]
+            del self.adjacent[t]
+        self.vertex_triangle[v] = None
+
+        new_triangles = []
+        while len(polygon) > 3:
+            ear, best = None, None
+            for i in range(len(polygon)):
+                a, b, c = polygon[i - 1], polygon[i], polygon[(i + 1) % len(polygon)]
+                pa, pb, pc = self.points[a], self.points[b], self.points[c]
+                if self.orientation(pa, pb, pc) <= 0:
+                    continue
+                # largest intrusion of another polygon vertex into the ear's circumcircle
+                intrusion = max(self.in_circumcircle(pa, pb, pc, self.points[d]) for d in polygon if d not in (a, b, c))
+                if best is None or intrusion < best:
+                    ear, best = i, intrusion
+                if intrusion <= 0:
+                    break
+
+            a, b, c = polygon[ear - 1], polygon[ear], polygon[(ear + 1) % len(polygon)]
+            t = self.add_triangle([a, b, c])
+            self.link(t, a, b, outside.pop((a, b)))
+            self.link(t, b, c, outside.pop((b, c)))
+            outside[(a, c)] = t
+            new_triangles.append(t)
+            del polygon[ear]
+
+        a, b, c = polygon
+        t = self.add_triangle([a, b, c])
+        for edge in ((a, b), (b, c), (c, a)):
+            self.link(t, edge[0], edge[1], outside.pop(edge))
+        new_triangles.append(t)
+        return new_triangles
+
+
+    def ring(self, v):
+        """Vertices around v in counter-clockwise order, paired with the triangle that follows each."""
+        start = t = self.vertex_triangle[v]
+        ring = []
+        while True:
+            vertices = self.triangles[t]
+            i = vertices.index(v)
+            ring.append((vertices[(i + 1) % 3], t))
+            t = self.adjacent[t][(i + 1) % 3]
+            if t == start or t is None:
+                return ring
+
+
+    def neighbours(self, v):
+        """Delauney neighbours of vertex v, excluding the super triangle."""
+        return [u for u, _ in self.ring(v) if not self.is_super(u)]
+
+
+    def delauney_triangles(self):
+        """Vertex id triples of every triangle not touching the super triangle."""
+        return [vertices for vertices in self.triangles.values()
+                if not any(self.is_super(u) for u in vertices)]
+
+
+def insertion_order(points):
+    """Order points along a snaking grid walk so consecutive insertions are close together."""
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    min_x, min_y = min(xs), min(ys)
+    rows = max(1, int(math.sqrt(len(points) / 4)))
+    row_height = (max(ys) - min_y) / rows or 1.0
+
+    def key(i):
+        row = min(int((points[i][1] - min_y) / row_height), rows - 1)
+        return row, points[i][0] if row % 2 == 0 else -points[i][0]
+
+    return sorted(range(len(points)), key=key)
+
+
+class DelauneyVoronoiGenerator(VoronoiGenerator):
+    """
+    Bowyer-Watson engine.
+
+    The seeds are triangulated directly, then a single dual pass clips every
+    cell from the bounding region against only its delauney neighbours.
+    """
+
+    # the triangulation is built serially, workers= is ignored
+    supports_workers = False
+
+    def __init__(self, points, padding=10, bounding_shape="rectangle", custom_shape=None):
+        super().__init__(points, padding, bounding_shape, custom_shape)
+        self.triangulation = None
+        self.vertex_ids = {}  # seed point -> vertex id in the triangulation
+
+
+    def triangulate(self, bounding_region=None):
+        """Build the delauney triangulation of the seed points (super triangle also covers bounding_region)."""
+        sites = list(dict.fromkeys(self.points))
+        self.triangulation = DelauneyTriangulation(sites + list(bounding_region or []))
+        self.vertex_ids = dict.fromkeys(sites)
+        for i in insertion_order(sites):
+            self.vertex_ids[sites[i]] = self.triangulation.insert(sites[i])
+        return self.triangulation
+
+
+    def iter_voronoi_cells(self, bounding_region):
+        """Triangulate once, then yield every cell as the dual of the delauney triangulation."""
+        triangulation = self.triangulate(bounding_region)
+
+        # seed order of each vertex (vertex_ids is keyed in seed order), so neighbours
+        # are clipped in the same order as VoronoiGenerator
+        order = {v: i for i, v in enumerate(self.vertex_ids.values())}
+        points = triangulation.points
+
+        for p in self.points:
+            neighbours = sorted(triangulation.neighbours(self.vertex_ids[p]), key=order.get)
+            yield self.bounded_cell(p, bounding_region, [points[u] for u in neighbours])
+
+
+    def delauney_triangles(self):
+        """Delauney triangles as lists of three seed points, the format returned by run_delauney."""
+        points = self.triangulation.points
+        return [[points[a], points[b], points[c]] for a, b, c in self.triangulation.delauney_triangles()]
+
+
+class DynamicVoronoi(DelauneyVoronoiGenerator):
+    """
+    Live Voronoi diagram that takes seed insertions and removals.
+
+    Cells are kept by cell id (the seed's vertex id in the triangulation, which
+    never changes while the seed is present). The bounding region is fixed when
+    the diagram is built, and a change only retriangulates the cavity or hole
+    around the seed and recomputes the cells of the seeds around it.
+    """
+
+    def __init__(self, points, padding=10, bounding_shape="rectangle", custom_shape=None):
+        super().__init__(points, padding, bounding_shape, custom_shape)
+        self.bounding_region = self.compute_bounding_region()
+        self.triangulate(self.bounding_region)
+        self.cells = {}
+        self.update_cells(self.vertex_ids.values())
+
+
+    def cell_id(self, point):
+        """Id of the cell of seed point."""
+        return self.vertex_ids[point]
+
+
+    def update_cells(self, ids):
+        """Recompute the cells with the given ids from their delauney neighbours."""
+        points = self.triangulation.points
+        for v in ids:
+            neighbours = [points[u] for u in self.triangulation.neighbours(v)]
+            self.cells[v] = self.bounded_cell(points[v], self.bounding_region, neighbours)
+
+
+    def insert(self, point):
+        """Add a seed and return the ids of the cells that changed, its own included."""
+        point = (float(point[0]), float(point[1]))
+        if point in self.vertex_ids:
+            return set()
+
+        v = self.triangulation.insert(point)
+        self.vertex_ids[point] = v
+        changed = {v, *self.triangulation.neighbours(v)}
+        self.update_cells(changed)
+        return changed
+
+
+    def remove(self, point):
+        """Remove a seed and return the ids of the cells that changed, the removed one included."""
+        v = self.vertex_ids.pop((float(point[0]), float(point[1])))
+        neighbours = set(self.triangulation.neighbours(v))
+        self.triangulation.remove(v)
+        del self.cells[v]
+        self.update_cells(neighbours)
+        return neighbours | {v}
+
+
+    def move(self, moves):
+        """
+        Move seeds to new positions, keeping their cell ids, and return the ids of the cells that changed.
+
+        moves maps cell id -> target point. The triangulation is repaired one seed at a
+        time (remove, then reinsert under the same id) and the touched cells are only
+        recomputed once at the end. A move onto another seed's position is skipped.
+        """
+        points = self.triangulation.points
+        order = list(self.vertex_ids.values())
+        changed = set()
+        for v, target in moves.items():
+            target = (float(target[0]), float(target[1]))
+            if target in self.vertex_ids:
+                continue
+            changed.update(self.triangulation.neighbours(v))
+            del self.vertex_ids[points[v]]
+            self.triangulation.remove(v)
+            self.triangulation.insert(target, v)
+            self.vertex_ids[target] = v
+            changed.add(v)
+            changed.update(self.triangulation.neighbours(v))
+
+        # keep the seeds in their original order
+        self.vertex_ids = {points[v]: v for v in order}
+        self.update_cells(changed)
+        return changed
+
+
+    def centroids(self, ids):
+        """(len(ids), 2) array of the area centroids of the given cells."""
+        cells = [self.cells[v] for v in ids]
+        offsets = np.cumsum([0] + [len(cell) for cell in cells])
+        return polygon_centroids([vertex for cell in cells for vertex in cell], offsets)
+
+
+    def relax(self, iterations=10, tol=0.01):
+        """
+        Lloyd relaxation: move every seed to the centroid of its cell, up to `iterations` times.
+
+        Each iteration works on the previous triangulation, so only the moved seeds and
+        their neighbours are retriangulated and recomputed, and the centroids of
+        untouched cells are reused. Seeds closer than `tol` to their centroid stay put,
+        and relaxation stops once no seed moves further than `tol`.
+
+        Returns the number of iterations run.
+        """
+        points = self.triangulation.points
+        centroids = {}
+        dirty = list(self.cells)
+        for iteration in range(iterations):
+            centroids.update(zip(dirty, map(tuple, self.centroids(dirty).tolist())))
+
+            moves = {v: c for v, c in centroids.items() if math.dist(points[v], c) >= tol}
+            if not moves:
+                return iteration
+            dirty = list(self.move(moves))
+        return iterations
+
+
+    def voronoi_cells(self, workers=None):
+        """Current cells keyed by seed point, in insertion order."""
+        points = self.triangulation.points
+        return {points[v]: self.cells[v] for v in self.vertex_ids.values()}
@@ -1,15 +1,35 @@
 import numpy as np
-import random
 import math
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def digit_table(base, table_size=1 << 16):
+    """Reversed value of every block of base digits below table_size, built once per base (read only)."""
+    digits = max(1, int(math.log(table_size) / math.log(base)))
+    block = base ** digits
+
+    # reversed value of every digit block 0..block-1
+    table = np.zeros(block)
+    remaining = np.arange(block)
+    f = 1.0 / base
+    for _ in range(digits):
+        table += f * (remaining % base)
+        remaining //= base
+        f /= base
+    table.flags.writeable = False
+    return table
+
 
 class PointGenerator:
-    def __init__(self, x_range, y_range, num_points, offset_x=0, offset_y=0):
-        """Initialize point generator with optional offsets."""
+    def __init__(self, x_range, y_range, num_points, offset_x=0, offset_y=0, seed=None):
+        """Initialize point generator with optional offsets and random seed."""
         self.x_range = x_range
         self.y_range = y_range
         self.num_points = num_points
         self.offset_x = offset_x
         self.offset_y = offset_y
+        self.rng = np.random.default_rng(seed)  # used by the random distributions
 
 
     def apply_offset(self, points):
@@ -17,32 +37,86 @@ class PointGenerator:
         return [(x + self.offset_x, y + self.offset_y) for x, y in points]
 
 
-    def fibonacci_spiral(self):
-        """Generate Fibonacci spiral points."""
-        
+    def apply_offset_array(self, points):
+        """Applies offset in place to an (N, 2) array of points."""
+        if self.offset_x or self.offset_y:
+            points += (self.offset_x, self.offset_y)
+        return points
+
+
+    @staticmethod
+    def as_tuples(points):
+        """Convert an (N, 2) array into the list of (x, y) tuples the rest of the code uses."""
+        return [tuple(p) for p in points.tolist()]
+
+
+    def fibonacci_spiral_array(self):
+        """Generate Fibonacci spiral points as an (N, 2) array."""
+
         #fibonacci is centered without any offsets
         self.offset_x = 0
         self.offset_y = 0
-        
+
         phi = (1 + np.sqrt(5)) / 2  # Golden Ratio
         max_radius = min(self.x_range / 2, self.y_range / 2)
 
-        sample_points = [
-            (
-                max_radius * np.sqrt(i / self.num_points) * np.cos(2 * np.pi * i / phi),
-                max_radius * np.sqrt(i / self.num_points) * np.sin(2 * np.pi * i / phi)
-            )
-            for i in range(self.num_points)
-        ]
+        # same operations as the scalar formula, done in place over the whole index range
+        i = np.arange(self.num_points, dtype=np.float64)
+        radius = np.sqrt(i / self.num_points)
+        radius *= max_radius
+        angle = i * (2 * np.pi)
+        angle /= phi
+
+        sample_points = np.empty((self.num_points, 2))
+        np.cos(angle, out=sample_points[:, 0])
+        np.sin(angle, out=sample_points[:, 1])
+        sample_points *= radius[:, None]
 
-        return self.apply_offset(sample_points)  # Apply offset here
+        return self.apply_offset_array(sample_points)
+
+
+    def fibonacci_spiral(self):
+        """Generate Fibonacci spiral points."""
+        return self.as_tuples(self.fibonacci_spiral_array())
+
+
+    def fibonacci_spiral_segments_array(self, n=3):
+        """Return every nth point from the Fibonacci spiral sequence as an (N, 2) array"""
+        return self.fibonacci_spiral_array()[::n]
 
 
     def fibonacci_spiral_segments(self, n=3):
         """Return every nth point from the Fibonacci spiral sequence"""
-        points = self.fibonacci_spiral()
-        return [ points[i] for i in range(0,len(points)) if i%n == 0 ]
-        
+        return self.as_tuples(self.fibonacci_spiral_segments_array(n))
+
+
+    def fibonacci_sphere_array(self):
+        """
+        Generate Fibonacci sphere points as an (N, 3) array of unit vectors.
+
+        Point i sits at height z = 1 - (2i + 1) / N and turns by the golden angle
+        from the one before, spreading the points evenly over the sphere. The
+        ranges and offsets are not used.
+        """
+        golden_angle = np.pi * (3 - np.sqrt(5))
+
+        i = np.arange(self.num_points, dtype=np.float64)
+        z = 1 - (2 * i + 1) / self.num_points
+        radius = np.sqrt(1 - z * z)
+        angle = i * golden_angle
+
+        sample_points = np.empty((self.num_points, 3))
+        np.cos(angle, out=sample_points[:, 0])
+        np.sin(angle, out=sample_points[:, 1])
+        sample_points[:, :2] *= radius[:, None]
+        sample_points[:, 2] = z
+        return sample_points
+
+
+    def fibonacci_sphere(self):
+        """Generate Fibonacci sphere points as (x, y, z) tuples."""
+        return self.as_tuples(self.fibonacci_sphere_array())
+
         
     def halton_sequence(self, index, base):
         """Generate a Halton sequence value."""
@@ -55,25 +129,162 @@ class PointGenerator:
         return result
 
 
+    @staticmethod
+    def radical_inverse(indices, base, table_size=1 << 16):
+        """
+        Vectorized Halton sequence values for an array of indices.
+
+        Digits are reversed a whole block at a time: a lookup table holds the
+        reversed value of every block of digits that fits in table_size, so 10M
+        indices only need two or three table lookups each.
+        """
+        table = digit_table(base, table_size)
+        block = len(table)
+
+        remaining = np.asarray(indices)
+        largest = int(remaining.max()) if remaining.size else 0
+        remaining = remaining.astype(np.uint32 if largest < 2 ** 32 else np.int64)
+
+        # lowest block of digits first, each further block is worth 1 / block as much
+        remaining, low = np.divmod(remaining, remaining.dtype.type(block))
+        result = table[low]
+        scale = 1.0
+        while largest >= block:
+            largest //= block
+            scale /= block
+            remaining, low = np.divmod(remaining, remaining.dtype.type(block))
+            result += table[low] * scale
+        return result
+
+
+    def halton_array(self):
+        """Generate Halton sequence points as an (N, 2) array."""
+        indices = np.arange(1, self.num_points + 1)
+        sample_points = np.empty((self.num_points, 2))
+        sample_points[:, 0] = self.radical_inverse(indices, 2)
+        sample_points[:, 1] = self.radical_inverse(indices, 3)
+        sample_points *= (self.x_range, self.y_range)
+        return self.apply_offset_array(sample_points)
+
+
     def halton_samples(self):
         """Generate Halton sequence points."""
-        sample_points = [(self.halton_sequence(i+1, 2) * self.x_range, 
-                          self.halton_sequence(i+1, 3) * self.y_range) for i in range(self.num_points)]
-        return self.apply_offset(sample_points)  # Apply offset
-
-
-    def poisson_disk_samples(self, min_dist=20):
-        """Generate Poisson-disk distributed points."""
-        points = []
-        while len(points) < self.num_points:
-            candidate = (random.uniform(0, self.x_range), random.uniform(0, self.y_range))
-            if all(math.dist(candidate, p) >= min_dist for p in points):
-                points.append(candidate)
-        
-        return self.apply_offset(points)  # Apply offset
+        return self.as_tuples(self.halton_array())
+
+
+    def poisson_disk_array(self, min_dist=20, k=30):
+        """
+        Bridson Poisson-disk sampling as an (M, 2) array, M <= num_points.
+
+        A background grid with cells of min_dist / sqrt(2) holds at most one point
+        each, so a candidate only needs checking against the 5 x 5 cells around it.
+        Points stay on the active list until k candidates in the annulus
+        [min_dist, 2 * min_dist] around them all fail. Sampling runs until the
+        whole area is full, since stopping at num_points would leave them in a
+        clump around the first point, then keeps a random num_points of them.
+        M is smaller than num_points when they don't fit at min_dist.
+        """
+        if not min_dist > 0:
+            raise ValueError(f"min_dist must be positive, got {min_dist}.")
+        if self.num_points <= 0:
+            return np.empty((0, 2))
+
+        cell = min_dist / math.sqrt(2)
+        columns, rows = int(math.ceil(self.x_range / cell)), int(math.ceil(self.y_range / cell))
+
+        # grid of point indices padded by two cells so the 5 x 5 window never leaves it,
+        # -1 marks an empty cell and picks the row of infinities at the end of points.
+        # every grid cell holds at most one point, so the full area fits in points
+        grid = np.full((columns + 4, rows + 4), -1, dtype=np.int64)
+        points = np.full((columns * rows + 2, 2), np.inf)
+        # the 5 x 5 window without its corners, which are at least min_dist away
+        window_x, window_y = np.array([(x, y) for x in range(-2, 3) for y in range(-2, 3) if abs(x * y) != 4]).T
+
+        def free(candidates):
+            """Which candidates are inside the area and at least min_dist from every placed point."""
+            inside = ((candidates[..., 0] >= 0) & (candidates[..., 0] < self.x_range) &
+                      (candidates[..., 1] >= 0) & (candidates[..., 1] < self.y_range))
+            # outside candidates are clamped onto the grid, inside already rules them out
+            cx = np.clip(candidates[..., 0] / cell, 0, columns - 1).astype(np.int64)[..., None] + 2 + window_x
+            cy = np.clip(candidates[..., 1] / cell, 0, rows - 1).astype(np.int64)[..., None] + 2 + window_y
+            near = points[grid[cx, cy]] - candidates[..., None, :]
+            return inside & ((near ** 2).sum(axis=-1) >= min_dist ** 2).all(axis=-1)
+
+        points[0] = self.rng.random(2) * (self.x_range, self.y_range)
+        grid[int(points[0, 0] / cell) + 2, int(points[0, 1] / cell) + 2] = 0
+        placed, active = 1, np.zeros(1, dtype=np.int64)
+
+        # up to batch active points are grown at once, so a step is a few large
+        # array operations instead of many small ones
+        batch = 64
+
+        while len(active):
+            if len(active) > batch:
+                chosen = self.rng.choice(len(active), batch, replace=False)
+            else:
+                chosen = np.arange(len(active))
+
+            # k candidates in the annulus around each chosen active point
+            radius = min_dist * (1 + self.rng.random((len(chosen), k, 1)))
+            angle = 2 * np.pi * self.rng.random((len(chosen), k))
+            candidates = points[active[chosen]][:, None] + radius * np.stack((np.cos(angle), np.sin(angle)), axis=2)
+
+            # first free candidate of every chosen point that has one. most points find one
+            # among their first few candidates, only the rest check all k
+            first = min(k, 4)
+            ok = free(candidates[:, :first])
+            found, pick = ok.any(axis=1), ok.argmax(axis=1)
+            rest = ~found
+            if k > first and rest.any():
+                ok = free(candidates[rest, first:])
+                found[rest], pick[rest] = ok.any(axis=1), first + ok.argmax(axis=1)
+            new = candidates[found, pick[found]]
+
+            # candidates of the same step can be too close to each other, keep the earlier one
+            clash = np.tril(((new[:, None] - new[None]) ** 2).sum(axis=2) < min_dist ** 2, -1)
+            keep = ~clash.any(axis=1)
+            for i in np.flatnonzero(~keep):
+                keep[i] = not (clash[i] & keep).any()
+            new = new[keep]
+
+            indices = np.arange(placed, placed + len(new))
+            points[indices] = new
+            grid[(new[:, 0] / cell).astype(np.int64) + 2, (new[:, 1] / cell).astype(np.int64) + 2] = indices
+            placed += len(new)
+
+            # no room left around the points without a free candidate, retire them
+            retired = np.zeros(len(active), dtype=bool)
+            retired[chosen[~found]] = True
+            active = np.concatenate((active[~retired], indices))
+
+        # a random subset of a Poisson-disk set keeps min_dist and spreads over the whole area.
+        # it stays in random order, so any prefix of it is spread out too
+        if placed > self.num_points:
+            points = points[self.rng.choice(placed, self.num_points, replace=False)]
+        else:
+            points = points[:placed]
+        return self.apply_offset_array(points)
+
+
+    def poisson_disk_samples(self, min_dist=20, k=30):
+        """Generate Poisson-disk distributed points (fewer than num_points if they don't fit at min_dist)."""
+        return self.as_tuples(self.poisson_disk_array(min_dist, k))
+
+
+    def random_array(self):
+        """Generate completely random points as an (N, 2) array."""
+        sample_points = self.rng.random((self.num_points, 2))
+        sample_points *= (self.x_range, self.y_range)
+        return self.apply_offset_array(sample_points)
 
 
     def random_distribution(self):
         """Generate completely random points."""
-        sample_points = [(random.uniform(0, self.x_range), random.uniform(0, self.y_range)) for _ in range(self.num_points)]
-        return self.apply_offset(sample_points)  # Apply offset
+        return self.as_tuples(self.random_array())
+
+
+    def random_sphere_array(self):
+        """Generate uniformly random points on the unit sphere as an (N, 3) array."""
+        sample_points = self.rng.standard_normal((self.num_points, 3))
+        sample_points /= np.linalg.norm(sample_points, axis=1)[:, None]
+        return sample_points
@@ -0,0 +1,166 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from distributions import PointGenerator
+from voronoi_algorithm import RegionClearance
+from voronoi_cells import ENGINES, generate_seed_points, generate_voronoi_cells
+
+
+# nested ("3 tier") voronoi diagrams: every cell of a level is split into its own
+# voronoi diagram, using the cell itself as the bounding region of its children.
+# the cells of one level don't depend on each other, so they are subdivided in parallel
+
+
+class VoronoiNode:
+    """
+    A cell in a hierarchical Voronoi diagram.
+
+    The root (level 0) stands for the whole area and has no cell or seed, the
+    cells of the first tier are its children (level 1), and so on. Every node
+    links to its parent, so a leaf can be followed up to the root.
+    """
+    __slots__ = ("cell", "seed", "level", "parent", "children")
+
+    def __init__(self, cell=None, seed=None, level=0, parent=None):
+        self.cell = cell  # list of (x, y) vertices, None for the root
+        self.seed = seed
+        self.level = level
+        self.parent = parent
+        self.children = []
+
+
+    def add_child(self, cell, seed):
+        """Append and return a child node one level down."""
+        child = VoronoiNode(cell, seed, self.level + 1, self)
+        self.children.append(child)
+        return child
+
+
+    def walk(self):
+        """Yield this node and every node below it, depth first."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+    def level_nodes(self, level):
+        """Nodes at the given level below this one, in order."""
+        nodes = [self]
+        for _ in range(level - self.level):
+            nodes = [child for node in nodes for child in node.children]
+        return nodes
+
+
+    def leaves(self):
+        """Nodes below this one without children."""
+        return [node for node in self.walk() if not node.children]
+
+
+    def ancestors(self):
+        """Parent, grandparent, ... up to the root."""
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+
+def seeds_in_polygon(polygon, num_points, distribution_method="halton", seed=None, attempts=8):
+    """
+    num_points seed points inside a polygon.
+
+    Points are drawn over the polygon's bounding box with the given distribution
+    and the first num_points inside are kept, drawing more while too few land
+    inside. Poisson min_dist is scaled to the polygon's area per point, and
+    shrinks along with every retry so the polygon has room for more points.
+    """
+    vertices = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    min_x, min_y = vertices.min(axis=0)
+    max_x, max_y = vertices.max(axis=0)
+    width, height = max_x - min_x, max_y - min_y
+    x, y = vertices[:, 0], vertices[:, 1]
+    area = abs(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2
+    if num_points <= 0 or area <= 0:
+        return []
+
+    # the even-odd test of RegionClearance, without its distance grid
+    region = RegionClearance(polygon, resolution=1)
+    count = math.ceil(num_points * width * height / area * 1.25) + 4
+    # a full Poisson-disk set holds about 0.7 * area / min_dist ** 2 points, so this fits ~1.4 * num_points
+    min_dist = 0.7 * math.sqrt(area / num_points)
+    for _ in range(attempts):
+        if distribution_method == "poisson":
+            points = PointGenerator(width, height, count, min_x, min_y, seed=seed).poisson_disk_array(min_dist)
+            min_dist /= math.sqrt(2)
+        else:
+            points = np.array(generate_seed_points(width, height, count, min_x, min_y, distribution_method, seed),
+                              dtype=np.float64).reshape(-1, 2)
+        if distribution_method.startswith("fibonacci"):
+            points += ((min_x + max_x) / 2, (min_y + max_y) / 2)  # the spiral is centred on the origin
+        inside = points[region.signed_distances(points) > 0]
+        if len(inside) >= num_points:
+            break
+        count *= 2
+    return [tuple(p) for p in inside[:num_points].tolist()]
+
+
+def subdivide_cell(task):
+    """Split one parent cell into (cells, seeds) of its children, as generate_voronoi_cells returns them."""
+    cell, num_points, distribution_method, engine, seed, lazy_boundary = task
+    if len(cell) < 3:
+        return [], []
+    seed_points = seeds_in_polygon(cell, num_points, distribution_method, seed)
+    if not seed_points:
+        return [], []
+
+    voronoi = ENGINES[engine](seed_points, bounding_shape="custom", custom_shape=list(cell))
+    voronoi.lazy_boundary = lazy_boundary
+    cells_dict = voronoi.voronoi_cells()
+    return voronoi.dictionary_to_list(cells_dict), list(cells_dict)
+
+
+def generate_hierarchical_voronoi(x_range, y_range, levels, offset_x=0, offset_y=0, distribution_method="halton", bounding_shape="rectangle", custom_shape=None, engine="clip", workers=None, seed=None, lazy_boundary=False):
+    """
+    Generate nested Voronoi diagrams, each cell split again by its own seeds.
+
+    Parameters are as for generate_voronoi_cells, plus:
+        levels (list of int): Seeds per level, e.g. [12, 6, 4] for 12 top cells each
+            holding 6 cells of 4 cells each. The first level is generated like
+            generate_voronoi_cells, every later one inside each cell of the level above.
+        workers (int, optional): Number of worker processes the cells of a level are
+            split across. Default is None (single process).
+        seed (int, optional): Seed for the "random" and "poisson" distributions, each
+            cell's children get their own stream derived from it. Default is None.
+
+    Returns:
+        VoronoiNode: the root, whose children are the first level cells.
+    """
+    root = VoronoiNode()
+    if not levels:
+        return root
+
+    cells, seed_points = generate_voronoi_cells(x_range, y_range, levels[0], offset_x, offset_y, distribution_method,
+                                                bounding_shape, custom_shape, engine, seed=seed, lazy_boundary=lazy_boundary)
+    parents = [root.add_child(cell, p) for cell, p in zip(cells, seed_points)]
+
+    executor = ProcessPoolExecutor(workers) if workers is not None and workers > 1 else None
+    try:
+        for level, num_points in enumerate(levels[1:], start=2):
+            tasks = [(parent.cell, num_points, distribution_method, engine,
+                      None if seed is None else (seed, level, i), lazy_boundary)
+                     for i, parent in enumerate(parents)]
+            if executor is None:
+                results = map(subdivide_cell, tasks)
+            else:
+                results = executor.map(subdivide_cell, tasks, chunksize=max(1, len(tasks) // (4 * workers)))
+
+            children = []
+            for parent, (cells, seed_points) in zip(parents, results):
+                children.extend(parent.add_child(cell, p) for cell, p in zip(cells, seed_points))
+            parents = children
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return root
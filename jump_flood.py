@@ -0,0 +1,169 @@
+import math
+import numpy as np
+from raster_renderer import RasterRenderer, hsv_to_rgba, hsv_palette
+
+
+# the "shader" approach from future_algorithm_voronoi.py: every pixel looks at a
+# few pixels k steps away and keeps the nearest seed any of them has seen, with k
+# halving each pass (jump flooding). every pass is a handful of whole-array numpy
+# operations, so there are at most log2(max(width, height)) passes over the P pixels
+# and no polygons are ever computed
+
+
+def first_step(column, row, width, height):
+    """
+    Largest jump needed for seeds planted at the given pixels.
+
+    The smallest power of two tile size for which every tile of the image holds
+    a seed bounds how far any pixel is from its nearest seed, so longer jumps
+    cannot find anything nearer. Dense seeds need far fewer passes this way.
+    """
+    full = 1 << max(0, math.ceil(math.log2(max(width, height, 1))) - 1)
+    tile = 1
+    while tile < full and len(column):
+        occupied = np.zeros((-(-height // tile), -(-width // tile)), dtype=bool)
+        occupied[row // tile, column // tile] = True
+        if occupied.all():
+            return tile
+        tile *= 2
+    return full
+
+
+def jump_flood(pixel_seeds, width, height, extra_passes=1):
+    """
+    Discrete Voronoi diagram of seeds given in pixel coordinates.
+
+    Returns (labels, distance): labels is an (height, width) int32 array with the
+    index of the nearest seed of every pixel (-1 if there are no seeds inside
+    the image), distance an (height, width) float32 array with the distance in
+    pixels from each pixel centre to that seed. extra_passes runs that many more
+    passes with step 1 (JFA+1), which fixes most of the rare mislabelled pixels.
+    Only the nearest of several seeds sharing one pixel is kept, so keep seeds at
+    least a pixel apart when every label matters.
+    """
+    seeds = np.asarray(pixel_seeds, dtype=np.float64).reshape(-1, 2)
+    labels = np.full((height, width), -1, dtype=np.int32)
+
+    # every pixel carries the position of its best seed so far (inf when none), so a
+    # pass reads shifted views instead of looking seeds up by label
+    nearest_x = np.full((height, width), np.inf, dtype=np.float32)
+    nearest_y = np.full((height, width), np.inf, dtype=np.float32)
+    best = np.full((height, width), np.inf, dtype=np.float32)
+
+    # plant every seed on its own pixel, the nearest one wins when several share a pixel
+    column, row = np.floor(seeds[:, 0]).astype(np.int64), np.floor(seeds[:, 1]).astype(np.int64)
+    inside = np.flatnonzero((column >= 0) & (column < width) & (row >= 0) & (row < height))
+    planted = (seeds[inside, 0] - column[inside] - 0.5) ** 2 + (seeds[inside, 1] - row[inside] - 0.5) ** 2
+    order = np.argsort(-planted)  # furthest first, so the nearest seed is written last
+    inside, planted = inside[order], planted[order]
+    labels[row[inside], column[inside]] = inside
+    nearest_x[row[inside], column[inside]] = seeds[inside, 0]
+    nearest_y[row[inside], column[inside]] = seeds[inside, 1]
+    best[row[inside], column[inside]] = planted
+
+    centre_x = np.arange(width, dtype=np.float32) + 0.5
+    centre_y = (np.arange(height, dtype=np.float32) + 0.5)[:, None]
+
+    step = first_step(column[inside], row[inside], width, height)
+    steps = []
+    while step >= 1:
+        steps.append(step)
+        step //= 2
+    steps += [1] * extra_passes
+
+    for step in steps:
+        # every pass reads the state left by the one before, as in the shader version
+        previous_labels, previous_x, previous_y = labels.copy(), nearest_x.copy(), nearest_y.copy()
+        for dy in (-step, 0, step):
+            for dx in (-step, 0, step):
+                if dx == 0 and dy == 0:
+                    continue
+                # target pixels [y0:y1, x0:x1] read the seed of the pixel (dx, dy) away
+                y0, y1 = max(0, -dy), min(height, height - dy)
+                x0, x1 = max(0, -dx), min(width, width - dx)
+                if y0 >= y1 or x0 >= x1:
+                    continue
+                target = np.s_[y0:y1, x0:x1]
+                source = np.s_[y0 + dy:y1 + dy, x0 + dx:x1 + dx]
+
+                d = np.square(centre_x[x0:x1] - previous_x[source])
+                d += np.square(centre_y[y0:y1] - previous_y[source])
+                better = d < best[target]
+                np.copyto(best[target], d, where=better)
+                np.copyto(labels[target], previous_labels[source], where=better)
+                np.copyto(nearest_x[target], previous_x[source], where=better)
+                np.copyto(nearest_y[target], previous_y[source], where=better)
+
+    return labels, np.sqrt(best)
+
+
+def voronoi_labels(seed_points, renderer, extra_passes=1):
+    """jump_flood for world seed points, in the pixel grid of a RasterRenderer."""
+    return jump_flood(renderer.to_pixels(seed_points), renderer.width, renderer.height, extra_passes)
+
+
+def cell_borders(labels):
+    """(height, width) bool array, True where a pixel's right or lower neighbour has another label."""
+    borders = np.zeros(labels.shape, dtype=bool)
+    borders[:, :-1] |= labels[:, :-1] != labels[:, 1:]
+    borders[:-1, :] |= labels[:-1, :] != labels[1:, :]
+    return borders
+
+
+def water_effect(labels, distance, colours=None, wavelength=12.0, depth=0.35, border=(20, 40, 70, 255), seed=None):
+    """
+    "water voronoi": cells in blues rippling outwards from their seeds.
+
+    The brightness of each cell colour follows a cosine of the distance to the
+    seed, and the cell borders are drawn in the border colour.
+    """
+    count = int(labels.max()) + 1
+    if colours is None:
+        colours = hsv_palette(max(count, 1), hue=(190 / 360, 215 / 360), saturation=(50 / 100, 80 / 100),
+                              value=(70 / 100, 95 / 100), seed=seed)
+    image = colours[np.maximum(labels, 0)].astype(np.float32)
+    ripple = 1.0 - depth * 0.5 * (1.0 + np.cos(2 * np.pi * distance / wavelength))
+    image[..., :3] *= ripple[..., None]
+    image = image.astype(np.uint8)
+    image[cell_borders(labels)] = border
+    image[labels < 0] = 0
+    return image
+
+
+def psychedelic_effect(labels, distance, period=40.0, saturation=0.9, seed=None):
+    """
+    "psychedelic space voronoi": every cell cycles through the whole hue circle
+    in rings around its seed, starting from its own random hue.
+    """
+    rng = np.random.default_rng(seed)
+    offsets = rng.random(int(labels.max()) + 1 if labels.size else 0)
+    hue = offsets[np.maximum(labels, 0)] + distance / period
+    value = np.where(cell_borders(labels), 0.1, 1.0)
+    image = hsv_to_rgba(hue.ravel(), saturation, value.ravel()).reshape(labels.shape + (4,))
+    image[labels < 0] = 0
+    return image
+
+
+def render_jump_flood(seed_points, width=1920, height=1080, effect=None, colours=None, path=None, seed=None):
+    """
+    Render seed points as a discrete voronoi diagram without computing any polygons.
+
+    effect is None (flat colours from hsv_palette), "water" or "psychedelic".
+    Returns the RGBA image, also written as PNG when path is given.
+    """
+    xs, ys = [p[0] for p in seed_points], [p[1] for p in seed_points]
+    renderer = RasterRenderer(width, height, (min(xs), min(ys), max(xs), max(ys)), margin=2)
+    labels, distance = voronoi_labels(seed_points, renderer)
+
+    if effect == "water":
+        renderer.image[:] = water_effect(labels, distance, colours, seed=seed)
+    elif effect == "psychedelic":
+        renderer.image[:] = psychedelic_effect(labels, distance, seed=seed)
+    elif effect is None:
+        renderer.paint_labels(labels, hsv_palette(len(seed_points), seed=seed) if colours is None else colours)
+    else:
+        raise ValueError(f"Unsupported effect: {effect}")
+
+    if path is not None:
+        renderer.save(path)
+    return renderer.image
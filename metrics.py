@@ -0,0 +1,104 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class Metrics:
+    """
+    Opt-in instrumentation for generate_voronoi_cells and run_delauney.
+
+    Pass an instance as metrics= to collect per phase wall times and counters.
+    Nothing is measured when metrics is None: the counting wrappers are only
+    put on the generator instance by instrument, so the clipping code itself
+    never checks for metrics.
+
+    callback, if given, is called as callback(event, data) with event "phase"
+    when a phase finishes and "progress" every progress_every cells.
+    """
+
+    def __init__(self, callback=None, progress_every=1000):
+        self.callback = callback
+        self.progress_every = progress_every
+        self.phases = {}    # phase name -> wall seconds
+        self.counters = {}  # counter name -> int
+        self.per_cell = {}  # name -> list with one value per cell
+
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block, adding to any earlier time for the same phase."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+            if self.callback is not None:
+                self.callback("phase", {"phase": name, "seconds": seconds})
+
+
+    def count(self, name, n=1):
+        """Add n to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+
+    def progress(self, phase, done, total):
+        """Report progress to the callback."""
+        if self.callback is not None:
+            self.callback("progress", {"phase": phase, "done": done, "total": total})
+
+
+    def instrument(self, voronoi):
+        """
+        Count clips, emitted vertices and finished cells of one generator instance.
+
+        The counting versions of clip_polygon (and clip_polygon_array for the numpy
+        engine) and bounded_cell shadow the class methods on this instance only.
+        Cells computed in worker processes are not counted.
+        """
+        clip_polygon = voronoi.clip_polygon
+        def counted_clip_polygon(polygon, f):
+            clipped = clip_polygon(polygon, f)
+            self.count("clip_polygon_calls")
+            self.count("vertices_emitted", len(clipped))
+            return clipped
+        voronoi.clip_polygon = counted_clip_polygon
+
+        if hasattr(voronoi, "clip_polygon_array"):
+            clip_polygon_array = voronoi.clip_polygon_array
+            def counted_clip_polygon_array(polygon, f, start=0):
+                clipped = clip_polygon_array(polygon, f, start)
+                self.count("clip_polygon_calls")
+                self.count("vertices_emitted", len(clipped))
+                return clipped
+            voronoi.clip_polygon_array = counted_clip_polygon_array
+
+        bounded_cell = voronoi.bounded_cell
+        total = len(voronoi.points)
+        def counted_bounded_cell(p, bounding_region, neighbours=None):
+            cell = bounded_cell(p, bounding_region, neighbours)
+            self.count("cells")
+            if self.counters["cells"] % self.progress_every == 0 or self.counters["cells"] == total:
+                self.progress("cells", self.counters["cells"], total)
+            return cell
+        voronoi.bounded_cell = counted_bounded_cell
+        return voronoi
+
+
+    def as_dict(self):
+        """Phases, counters and per cell values as a plain dict."""
+        return {"phases": dict(self.phases), "counters": dict(self.counters), "per_cell": dict(self.per_cell)}
+
+
+    def to_json(self, path=None):
+        """Metrics as a JSON string, also written to path if given."""
+        text = json.dumps(self.as_dict(), indent=2)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+
+def phase(metrics, name):
+    """metrics.phase(name), or a no-op context when metrics is None."""
+    return nullcontext() if metrics is None else metrics.phase(name)
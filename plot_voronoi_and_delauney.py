@@ -2,9 +2,24 @@ import queue
 import threading
 import turtle
 import time
-from voronoi_cells import generate_voronoi_cells
+from voronoi_cells import generate_voronoi_cells, generate_voronoi_and_delauney
 from voronoi_to_delauney import generate_quadrants, run_delauney
 
+# "batched" draws every layer with one reusable pen, tracer(0) and an update() every
+# UPDATE_EVERY primitives, spending at most FRAME_BUDGET seconds per frame.
+# "animated" is the original mode with a new turtle per shape
+RENDER_MODE = "batched"
+UPDATE_EVERY = 100
+FRAME_BUDGET = 0.05
+FRAME_INTERVAL = 10  # ms between frames
+
+# line width and colour of each layer, as used by the animated TurtleDrawing calls
+LAYER_STYLES = {
+    "voronoi": (5, "black"),
+    "delauney": (3, "green"),
+    "quadrants": (1, "red"),
+}
+
 class TurtleDrawing:
     def __init__(self, name, vertices, line_width=5, line_colour="black", spawn_draw=False):
         """Create a turtle object to draw given vertices with customizable width."""
@@ -32,6 +47,44 @@ class TurtleDrawing:
         self.turtle_object.goto(self.vertices[0])  # Close the shape
 
         
+class LayerPen:
+    """One hidden turtle that draws every shape of a layer, instead of a turtle per shape."""
+
+    def __init__(self, line_width=5, line_colour="black"):
+        self.turtle_object = turtle.Turtle()
+        self.turtle_object.hideturtle()
+        self.turtle_object.speed(0)
+        self.turtle_object.width(line_width)
+        self.turtle_object.color(line_colour)
+
+
+    def draw_polygon(self, vertices):
+        """Draw a closed polygon through vertices."""
+        self.turtle_object.penup()
+        self.turtle_object.goto(vertices[0])
+        self.turtle_object.pendown()
+
+        for x, y in vertices:
+            self.turtle_object.goto(x, y)
+
+        self.turtle_object.goto(vertices[0])  # Close the shape
+
+
+def layer_pen(layer):
+    """The reusable pen of a layer, created on first use."""
+    if layer not in layer_pens:
+        layer_pens[layer] = LayerPen(*LAYER_STYLES[layer])
+    return layer_pens[layer]
+
+
+def draw_shape(layer, name, vertices):
+    """Draw one shape of a layer, with the layer pen in batched mode or its own turtle otherwise."""
+    if RENDER_MODE == "batched":
+        layer_pen(layer).draw_polygon(vertices)
+    else:
+        TurtleDrawing(name, vertices, *LAYER_STYLES[layer], True)
+
+
 def compute_square_vertices(quadrant):
     """Compute the four vertex points of a square centered at the quadrant's midpoint."""
     x, y = quadrant.midpoint
@@ -48,13 +101,13 @@ def compute_square_vertices(quadrant):
 def draw_delauney_cells(shape_vertices):
     """Queue Delauney cell drawing operations."""
     for i, vertices in enumerate(shape_vertices):
-        graphics.put(lambda v=vertices, idx=i: TurtleDrawing("delauney_" + str(idx), v, 3, "green", True))
+        graphics.put(lambda v=vertices, idx=i: draw_shape("delauney", "delauney_" + str(idx), v))
 
 
 def draw_voronoi_cells(shape_vertices):
     """Queue Voronoi cell drawing operations."""
     for i, vertices in enumerate(shape_vertices):
-        graphics.put(lambda v=vertices, idx=i: TurtleDrawing("voronoi_" + str(idx), v, 5, "black", True))
+        graphics.put(lambda v=vertices, idx=i: draw_shape("voronoi", "voronoi_" + str(idx), v))
         
 
 def draw_single_seed_point(x, y, name=None):
@@ -76,11 +129,15 @@ def draw_quadrants(quadrants):
 
     for i, quadrant in enumerate(quadrants_list):
         square_vertices = compute_square_vertices(quadrant)
-        graphics.put(lambda i=i, v=square_vertices: TurtleDrawing("quadrant_" + str(i), v, 1, "red", True))  # Set width to 1
+        graphics.put(lambda i=i, v=square_vertices: draw_shape("quadrants", "quadrant_" + str(i), v))  # Set width to 1
 
 
 def process_queue():
     """Process queued drawing functions."""
+    if RENDER_MODE == "batched":
+        process_queue_batched()
+        return
+
     while not graphics.empty():
         task = graphics.get()
         task()
@@ -89,6 +146,21 @@ def process_queue():
     turtle.ontimer(process_queue, 50)
 
 
+def process_queue_batched():
+    """Draw queued shapes for up to FRAME_BUDGET seconds, refreshing the screen every UPDATE_EVERY shapes."""
+    start = time.perf_counter()
+    drawn = 0
+    while not graphics.empty() and time.perf_counter() - start < FRAME_BUDGET:
+        graphics.get()()
+        drawn += 1
+        if drawn % UPDATE_EVERY == 0:
+            turtle.update()
+
+    if drawn:
+        turtle.update()
+    turtle.ontimer(process_queue, FRAME_INTERVAL)
+
+
 def plot_voronoi(shape_vertices):
     """Start Voronoi cell plotting."""
     thread = threading.Thread(target=draw_voronoi_cells, args=(shape_vertices,))
@@ -118,11 +190,16 @@ def plot_quadrants(quadrants):
 
 def initialize_turtle_screen():
     """Initialize the Turtle screen settings."""
-    global seed_turtle
+    global seed_turtle, layer_pens
     turtle.TurtleScreen._RUNNING = True
     turtle.resetscreen()
     turtle.setup(width=0.9, height=0.9)
 
+    # batched mode redraws only on explicit turtle.update() calls
+    layer_pens = {}
+    if RENDER_MODE == "batched":
+        turtle.tracer(0, 0)
+
     # Create a single hidden turtle for seed points
     seed_turtle = turtle.Turtle()
     seed_turtle.hideturtle()
@@ -147,18 +224,27 @@ def compute_window_size():
 
 def generate_data():
     """Generate Voronoi cells, seed points, and quadrants."""
+    settings = dict(
+        x_range=X_RANGE, y_range=Y_RANGE, num_points=200, 
+        offset_x=-X_RANGE/2, offset_y=-Y_RANGE/2, distribution_method="fibonacci_segments"
+    )
+    # Choose a distribution method
+    #"halton":
+    #"fibonacci"
+    #"fibonacci_segments"
+    #"poisson"
+    #"random"
+
+    # fast path: triangulate the seed points directly (bowyer-watson) and take the voronoi cells as its dual
     try:
-        voronoi_data, seed_points = generate_voronoi_cells(
-            x_range=X_RANGE, y_range=Y_RANGE, num_points=200, 
-            offset_x=-X_RANGE/2, offset_y=-Y_RANGE/2, distribution_method="fibonacci_segments"
-        )
-        # Choose a distribution method
-        #"halton":
-        #"fibonacci"
-        #"fibonacci_segments"
-        #"poisson"
-        #"random"
-        
+        voronoi_data, seed_points, delauney_triangles = generate_voronoi_and_delauney(**settings)
+        quadrants = generate_quadrants(voronoi_data)  # only needed for plotting now
+        return voronoi_data, seed_points, quadrants, delauney_triangles
+    except Exception as e:
+        print(f"Direct delauney failed, falling back to cell conversion: {e}")
+
+    try:
+        voronoi_data, seed_points = generate_voronoi_cells(**settings)
         quadrants, delauney_triangles = run_delauney(voronoi_data, seed_points)
         return voronoi_data, seed_points, quadrants, delauney_triangles
     except Exception as e:
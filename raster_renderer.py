@@ -0,0 +1,253 @@
+import struct
+import zlib
+from itertools import chain
+import numpy as np
+
+
+# headless alternative to the turtle plotting: cells, triangles and seeds are
+# rasterized with numpy into an RGBA array and written out as PNG, no display needed
+
+
+def hsv_to_rgba(h, s, v, alpha=1.0):
+    """Vectorized colorsys.hsv_to_rgb, returning an (n, 4) uint8 RGBA array."""
+    h, s, v = np.broadcast_arrays(np.asarray(h, dtype=np.float64) % 1.0,
+                                  np.asarray(s, dtype=np.float64), np.asarray(v, dtype=np.float64))
+    i = (h * 6.0).astype(int) % 6
+    f = h * 6.0 - np.floor(h * 6.0)
+    p, q, t = v * (1.0 - s), v * (1.0 - s * f), v * (1.0 - s * (1.0 - f))
+
+    # the six sextants of colorsys.hsv_to_rgb
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    a = np.full(r.shape, alpha)
+    return np.round(np.stack((r, g, b, a), axis=-1).reshape(-1, 4) * 255).astype(np.uint8)
+
+
+def hsv_palette(n, hue=60 / 360, saturation=80 / 100, value=(60 / 100, 100 / 100), seed=None):
+    """
+    n random cell colours in the style of honeycomb.paint_hexagons.
+
+    hue, saturation and value are each a number or a (low, high) range that is
+    sampled uniformly per cell.
+    """
+    rng = np.random.default_rng(seed)
+    sample = lambda x: rng.uniform(x[0], x[1], n) if isinstance(x, tuple) else np.full(n, x)
+    return hsv_to_rgba(sample(hue), sample(saturation), sample(value))
+
+
+def write_png(path, image, level=3):
+    """Write an (H, W, 4) uint8 RGBA array as a PNG file with zlib and struct only."""
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+
+    # every row starts with filter type 0 (none)
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, width * 4)
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data +
+                struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    with open(path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+        file.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), level)))
+        file.write(chunk(b"IEND", b""))
+
+
+def flatten_polygons(polygons):
+    """(E, 2) vertex array and (n + 1,) offsets from a list of polygons of (x, y) tuples."""
+    counts = np.fromiter(map(len, polygons), dtype=np.int64, count=len(polygons))
+    offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    vertices = np.fromiter(chain.from_iterable(chain.from_iterable(polygons)), dtype=np.float64,
+                           count=2 * int(offsets[-1])).reshape(-1, 2)
+    return vertices, offsets
+
+
+def polygon_edges(vertices, offsets):
+    """(start, end, polygon) of every polygon edge, closing each polygon back to its first vertex."""
+    counts = np.diff(offsets)
+    filled = counts > 0
+    following = np.arange(1, len(vertices) + 1)
+    following[offsets[1:][filled] - 1] = offsets[:-1][filled]
+    polygon = np.repeat(np.arange(len(counts)), counts)
+    return vertices, vertices[following], polygon
+
+
+def expand_ranges(starts, lengths):
+    """Concatenation of arange(start, start + length) for every range."""
+    lengths = np.maximum(lengths, 0)
+    total = int(lengths.sum())
+    first = np.cumsum(lengths) - lengths
+    return np.repeat(starts - first, lengths) + np.arange(total), lengths
+
+
+class RasterRenderer:
+    """
+    Scanline rasterizer for voronoi cells and delauney triangles.
+
+    World coordinates (y up, as in turtle) are fitted into the image with a
+    uniform scale. Polygons are filled with the even-odd rule at pixel centres,
+    one vectorized pass over every edge of every polygon, and later polygons
+    paint over earlier ones.
+    """
+
+    def __init__(self, width, height, extent, background=(255, 255, 255, 255), margin=0):
+        """
+        Parameters:
+        - width, height: Image size in pixels.
+        - extent: (min_x, min_y, max_x, max_y) of the world area to show.
+        - background: RGBA colour of the empty image.
+        - margin: Empty border in pixels.
+        """
+        self.width = width
+        self.height = height
+        self.image = np.empty((height, width, 4), dtype=np.uint8)
+        self.image[:] = background
+
+        min_x, min_y, max_x, max_y = extent
+        self.scale = min((width - 2 * margin) / max(max_x - min_x, 1e-12),
+                         (height - 2 * margin) / max(max_y - min_y, 1e-12))
+        # centre the extent in the image
+        self.origin_x = (width - (max_x - min_x) * self.scale) / 2 - min_x * self.scale
+        self.origin_y = (height - (max_y - min_y) * self.scale) / 2 + max_y * self.scale
+
+
+    def to_pixels(self, vertices):
+        """World (x, y) array to pixel (column, row) array."""
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        return np.column_stack((self.origin_x + vertices[:, 0] * self.scale,
+                                self.origin_y - vertices[:, 1] * self.scale))
+
+
+    def colour_rows(self, colours, n):
+        """(n, 4) uint8 colours from a single RGBA colour or a per polygon array."""
+        colours = np.asarray(colours, dtype=np.uint8)
+        if colours.ndim == 1:
+            colours = np.broadcast_to(colours, (n, 4))
+        return colours
+
+
+    def fill_array(self, vertices, offsets, colours):
+        """Fill polygons given as a flat world vertex array and offsets."""
+        start, end, polygon = polygon_edges(self.to_pixels(vertices), offsets)
+        colours = self.colour_rows(colours, len(offsets) - 1)
+
+        # rows whose pixel centre r + 0.5 lies in [min y, max y) of each edge
+        low, high = np.minimum(start[:, 1], end[:, 1]), np.maximum(start[:, 1], end[:, 1])
+        first = np.clip(np.ceil(low - 0.5), 0, self.height).astype(np.int64)
+        last = np.clip(np.ceil(high - 0.5), 0, self.height).astype(np.int64)
+        rows, counts = expand_ranges(first, last - first)
+
+        # crossing x of every edge with every row it spans
+        edge = np.repeat(np.arange(len(start)), counts)
+        x0, y0 = start[edge, 0], start[edge, 1]
+        slope = (end[edge, 0] - x0) / (end[edge, 1] - y0)
+        x = x0 + (rows + 0.5 - y0) * slope
+
+        # group crossings by polygon and row with one integer key. edges come in polygon
+        # order, so the stable sort is cheap, and convex polygons (every voronoi cell)
+        # have exactly two crossings per row
+        owner = polygon[edge]
+        key = owner * self.height + rows
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        if len(key) and ((key[0::2] != key[1::2]).any() or (key[2::2] == key[1:-1:2]).any()):
+            # some row crosses a polygon more than twice: also sort by x within each group
+            order = order[np.argsort(x[order], kind="stable")]
+            order = order[np.argsort(owner[order] * self.height + rows[order], kind="stable")]
+        x, rows, owner = x[order], rows[order], owner[order]
+
+        # pair up crossings per polygon and row, left to right (even-odd rule)
+        left, right = np.minimum(x[0::2], x[1::2]), np.maximum(x[0::2], x[1::2])
+        rows, owner = rows[0::2], owner[0::2]
+
+        columns_start = np.clip(np.ceil(left - 0.5), 0, self.width).astype(np.int64)
+        columns_end = np.clip(np.ceil(right - 0.5), 0, self.width).astype(np.int64)
+        pixels, lengths = expand_ranges(rows * self.width + columns_start, columns_end - columns_start)
+        self.image.reshape(-1, 4)[pixels] = colours[np.repeat(owner, lengths)]
+
+
+    def fill_polygons(self, polygons, colours):
+        """Fill a list of polygons (lists of (x, y) tuples) with one colour or a colour per polygon."""
+        if len(polygons):
+            self.fill_array(*flatten_polygons(polygons), colours)
+
+
+    def stroke_array(self, vertices, offsets, colour, width=1):
+        """Draw the outline of polygons given as a flat world vertex array and offsets."""
+        start, end, _ = polygon_edges(self.to_pixels(vertices), offsets)
+
+        # sample every edge once per pixel along its longer axis
+        delta = end - start
+        steps = np.ceil(np.abs(delta).max(axis=1)).astype(np.int64) + 1
+        t_index, _ = expand_ranges(np.zeros(len(steps), dtype=np.int64), steps)
+        edge = np.repeat(np.arange(len(steps)), steps)
+        t = t_index / np.maximum(steps[edge] - 1, 1)
+        points = start[edge] + t[:, None] * delta[edge]
+        self.plot_pixels(points, colour, width)
+
+
+    def stroke_polygons(self, polygons, colour, width=1):
+        """Draw the outline of a list of polygons in one colour."""
+        if len(polygons):
+            self.stroke_array(*flatten_polygons(polygons), colour, width)
+
+
+    def plot_pixels(self, points, colour, width=1):
+        """Paint width x width pixel squares centred on pixel positions."""
+        centre = np.floor(points).astype(np.int64)
+        reach = np.arange(width) - (width - 1) // 2
+        dx, dy = np.meshgrid(reach, reach)
+        columns = (centre[:, 0, None] + dx.ravel()).ravel()
+        rows = (centre[:, 1, None] + dy.ravel()).ravel()
+        inside = (columns >= 0) & (columns < self.width) & (rows >= 0) & (rows < self.height)
+        self.image.reshape(-1, 4)[rows[inside] * self.width + columns[inside]] = colour
+
+
+    def draw_points(self, points, colour, size=3):
+        """Draw world points as size x size squares."""
+        if len(points):
+            self.plot_pixels(self.to_pixels(points), colour, size)
+
+
+    def paint_labels(self, labels, colours):
+        """Colour every pixel of an (height, width) label image (jump_flood output) by its label, -1 is left alone."""
+        colours = np.asarray(colours, dtype=np.uint8)
+        labelled = labels >= 0
+        self.image[labelled] = colours[labels[labelled]]
+
+
+    def save(self, path, level=3):
+        """Write the image as PNG."""
+        write_png(path, self.image, level)
+
+
+def polygon_extent(polygons):
+    """(min_x, min_y, max_x, max_y) of a list of polygons."""
+    vertices, _ = flatten_polygons(polygons)
+    return (*vertices.min(axis=0), *vertices.max(axis=0))
+
+
+def render_voronoi(voronoi_data, seed_points=None, delauney_triangles=None, width=1920, height=1080,
+                   colours=None, outline=(40, 40, 40, 255), triangle_colour=(200, 30, 30, 255),
+                   seed_colour=(0, 0, 0, 255), path=None):
+    """
+    Render the output of generate_voronoi_cells (and optionally run_delauney) to an RGBA array.
+
+    colours defaults to hsv_palette(len(voronoi_data)). Pass None for outline,
+    triangle_colour or seed_colour to leave that layer out. Writes a PNG when path is given.
+    """
+    renderer = RasterRenderer(width, height, polygon_extent(voronoi_data), margin=2)
+    renderer.fill_polygons(voronoi_data, hsv_palette(len(voronoi_data)) if colours is None else colours)
+    if outline is not None:
+        renderer.stroke_polygons(voronoi_data, outline)
+    if delauney_triangles and triangle_colour is not None:
+        renderer.stroke_polygons(delauney_triangles, triangle_colour)
+    if seed_points and seed_colour is not None:
+        renderer.draw_points(seed_points, seed_colour)
+    if path is not None:
+        renderer.save(path)
+    return renderer.image
@@ -0,0 +1,362 @@
+import math
+import random
+import numpy as np
+from delauney_algorithm import DelauneyTriangulation
+from distributions import PointGenerator
+
+
+# voronoi diagrams on the unit sphere ("earth voronoi"). the delauney triangulation of
+# points on a sphere is their 3d convex hull, built here by the same incremental
+# bowyer-watson insertion as the plane: a point lies inside a triangle's circumcircle
+# exactly when it lies above the triangle's plane, so the cavity of a new point is the
+# part of the hull it can see. the voronoi cells are the dual: the circumcentres of
+# the triangles around each seed, which are the triangles' outward unit normals. that
+# holds for seeds in one hemisphere too, where the faces across the empty side of the
+# hull have the centre of the sphere above them
+
+
+def sphere_orientation(a, b, c):
+    """Positive when c lies left of the great circle a -> b, seen from outside the sphere."""
+    return ((a[1] * b[2] - a[2] * b[1]) * c[0] +
+            (a[2] * b[0] - a[0] * b[2]) * c[1] +
+            (a[0] * b[1] - a[1] * b[0]) * c[2])
+
+
+def in_circumcap(a, b, c, d):
+    """Positive when d lies inside the circumcircle of the counter-clockwise spherical triangle abc."""
+    bx, by, bz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    cx, cy, cz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    dx, dy, dz = d[0] - a[0], d[1] - a[1], d[2] - a[2]
+    # d above the plane of abc, on the side its outward normal points to
+    return (by * cz - bz * cy) * dx + (bz * cx - bx * cz) * dy + (bx * cy - by * cx) * dz
+
+
+def sphere_point(p):
+    """Point p as the (x, y, z) float tuple the triangulation stores."""
+    return (float(p[0]), float(p[1]), float(p[2]))
+
+
+def unit_vectors(points):
+    """(N, 3) float64 array of points scaled onto the unit sphere."""
+    points = np.array(points, dtype=np.float64).reshape(-1, 3)
+    points /= np.linalg.norm(points, axis=1)[:, None]
+    return points
+
+
+def tetrahedron_seeds(points):
+    """
+    Rows of four distinct points spanning a tetrahedron, picked greedily to be large.
+
+    The point furthest from the first one, then the one furthest from the line
+    through both, then the one furthest from the plane through all three.
+    Raises ValueError when every point lies in that plane, that is on one
+    circle of the sphere.
+    """
+    first = points[0]
+    second = int(np.argmax(((points - first) ** 2).sum(axis=1)))
+    third = int(np.argmax((np.cross(points[second] - first, points - first) ** 2).sum(axis=1)))
+    normal = np.cross(points[second] - first, points[third] - first)
+    heights = (points - first) @ normal
+    fourth = int(np.argmax(np.abs(heights)))
+    if abs(heights[fourth]) <= 1e-9 * np.linalg.norm(normal):
+        raise ValueError("Seeds must not all lie on one circle of the sphere, "
+                         "at least 4 distinct seeds off a common plane are needed.")
+    return [0, second, third, fourth]
+
+
+def sphere_insertion_order(points):
+    """
+    Order unit vectors along a snaking walk over bands of height, so consecutive
+    insertions are close together (the spherical insertion_order).
+    """
+    rows = max(1, int(math.sqrt(len(points) / 8)))
+    row = np.minimum(((1 - points[:, 2]) / 2 * rows).astype(np.int64), rows - 1)
+    longitude = np.arctan2(points[:, 1], points[:, 0])
+    return np.lexsort((np.where(row % 2 == 0, longitude, -longitude), row)).tolist()
+
+
+def lon_lat(vectors, degrees=True):
+    """(K, 2) array of the longitude and latitude of unit vectors."""
+    vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, 3)
+    result = np.column_stack((np.arctan2(vectors[:, 1], vectors[:, 0]),
+                              np.arcsin(np.clip(vectors[:, 2], -1, 1))))
+    return np.degrees(result) if degrees else result
+
+
+def arc_points(cell, step):
+    """
+    A cell's unit vectors with points added along every edge, at most step radians apart.
+
+    Straight lines between projected vertices are not the great circle arcs
+    between them. On large cells (seeds in one hemisphere) the difference is
+    enough for edges to cross, so the arcs are sampled before projecting.
+    """
+    following = np.roll(cell, -1, axis=0)
+    angle = np.arccos(np.clip(np.einsum("ij,ij->i", cell, following), -1, 1))
+    counts = np.maximum(1, np.ceil(angle / step)).astype(np.int64)
+
+    # edge of every output point and its fraction t along that edge
+    edge = np.repeat(np.arange(len(cell)), counts)
+    t = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)) / counts[edge]
+    angle = angle[edge]
+    sine = np.sin(angle)
+    arc = sine > 1e-12
+    sine[~arc] = 1.0
+    # spherical interpolation, plain linear on edges too short to have a sine
+    start = np.where(arc, np.sin((1 - t) * angle) / sine, 1 - t)
+    end = np.where(arc, np.sin(t * angle) / sine, t)
+    points = start[:, None] * cell[edge] + end[:, None] * following[edge]
+    return points / np.linalg.norm(points, axis=1)[:, None]
+
+
+def project_cell(cell, seed, step=math.radians(2)):
+    """
+    A spherical cell as an (x, y) polygon in radians of longitude and latitude.
+
+    Edges are sampled every step radians with arc_points. Longitudes are
+    unwrapped along the cell, so a cell across the antimeridian stays in one
+    piece and reaches past +-pi on the side of its seed. A cell around a pole
+    goes once round in longitude instead: it is cut open at the antimeridian
+    and closed along the pole's latitude, spanning -pi..pi.
+    """
+    radians = lon_lat(arc_points(cell, step), degrees=False)
+    longitude = np.unwrap(radians[:, 0])
+    latitude = radians[:, 1]
+
+    # a full turn, closing the ring, means the cell holds a pole
+    closing = (longitude[0] - longitude[-1] + math.pi) % (2 * math.pi) - math.pi
+    turn = longitude[-1] + closing - longitude[0]
+    if abs(turn) < math.pi:
+        seed_longitude = math.atan2(seed[1], seed[0])
+        longitude += 2 * math.pi * round((seed_longitude - longitude[0]) / (2 * math.pi))
+        return np.column_stack((longitude, latitude))
+
+    # longitude only grows (or only shrinks) round a pole: start the ring in -pi..pi
+    # and cut it where it crosses the antimeridian at side = +-pi
+    sign = math.copysign(1, turn)
+    side = sign * math.pi
+    longitude = np.append(longitude, longitude[0] + turn)
+    latitude = np.append(latitude, latitude[0])
+    longitude -= 2 * side * math.floor((sign * longitude[0] + math.pi) / (2 * math.pi))
+    j = int(np.argmax(sign * longitude >= math.pi)) - 1
+    fraction = (side - longitude[j]) / (longitude[j + 1] - longitude[j])
+    cut = latitude[j] + fraction * (latitude[j + 1] - latitude[j])
+    pole = sign * math.pi / 2  # counter-clockwise seen from outside, longitude grows round the north pole
+
+    longitude = np.concatenate(([-side], longitude[j + 1:-1] - 2 * side, longitude[:j + 1], [side, side, -side]))
+    latitude = np.concatenate(([cut], latitude[j + 1:-1], latitude[:j + 1], [cut, pole, pole]))
+    return np.column_stack((longitude, latitude))
+
+
+class SphericalTriangulation(DelauneyTriangulation):
+    """
+    Incremental delauney triangulation of points on the unit sphere.
+
+    Starts from a tetrahedron of four of the points instead of a super
+    triangle, so every triangle is a real one and every triangle has three
+    neighbours. Triangles are counter-clockwise seen from outside the hull.
+
+    The hull only grows, so the tetrahedron's centroid stays inside it and the
+    walk steers around that centre rather than the sphere's. The centre of the
+    sphere can lie outside the hull, when all points are in one hemisphere.
+    """
+
+    in_circumcircle = staticmethod(in_circumcap)
+    as_point = staticmethod(sphere_point)
+
+    def __init__(self, tetrahedron):
+        self.points = [sphere_point(p) for p in tetrahedron]
+        self.centre = tuple(sum(p[k] for p in self.points) / 4 for k in range(3))
+        self.triangles = {}
+        self.adjacent = {}
+        self.vertex_triangle = [None] * 4
+        self.next_triangle = 0
+        self.last = 0
+        self.walk_turn = 0
+        self.walk_random = random.Random(0)
+
+        # one face opposite each corner, turned so the corner lies below it
+        faces = []
+        for corner in range(4):
+            a, b, c = (v for v in range(4) if v != corner)
+            if in_circumcap(self.points[a], self.points[b], self.points[c], self.points[corner]) > 0:
+                b, c = c, b
+            faces.append(self.add_triangle([a, b, c]))
+        for t in faces:
+            for n in faces:
+                if n != t:
+                    a, b = (v for v in self.triangles[t] if v in self.triangles[n])
+                    self.link(t, a, b, n)
+
+
+    def is_super(self, v):
+        """The sphere has no super triangle."""
+        return False
+
+
+    def orientation(self, a, b, c):
+        """Positive when c lies left of a -> b, seen from outside the hull around its centre."""
+        ox, oy, oz = self.centre
+        return sphere_orientation((a[0] - ox, a[1] - oy, a[2] - oz), (b[0] - ox, b[1] - oy, b[2] - oz),
+                                  (c[0] - ox, c[1] - oy, c[2] - oz))
+
+
+    def locate(self, p):
+        """
+        Walk from the last touched triangle to a triangle containing p.
+
+        Seen from the centre, p lies in exactly one triangle, which faces p.
+        The deterministic tests of the plane's walk can go round in circles
+        here, so each step crosses a random one of the edges p lies beyond,
+        which reaches p with probability 1 (a stochastic walk).
+        """
+        t = self.last if self.last in self.triangles else next(iter(self.triangles))
+        points, choice, orientation = self.points, self.walk_random.choice, self.orientation
+        while True:
+            vertices = self.triangles[t]
+            beyond = [i for i in range(3)
+                      if orientation(points[vertices[(i + 1) % 3]], points[vertices[(i + 2) % 3]], p) < 0]
+            if not beyond:
+                return t
+            t = self.adjacent[t][beyond[0] if len(beyond) == 1 else choice(beyond)]
+
+
+class SphericalVoronoi:
+    """
+    Voronoi diagram of seed points on the unit sphere.
+
+    - seeds: (N, 3) float64 array of unit vectors
+    - vertices: (M, 3) float64 array of unit vectors, the circumcentre of every triangle
+    - triangles: (M, 3) int64 array of seed rows, counter-clockwise seen from outside
+    - cell_offsets: (N + 1,) int64 array, cell i uses cell_vertices[cell_offsets[i]:cell_offsets[i + 1]]
+    - cell_vertices: (E,) int64 array of indices into vertices, counter-clockwise seen from outside
+
+    Inserting the seeds in sphere_insertion_order keeps each walk to a few
+    triangles on average, so triangulating N seeds is O(N log N) with the sort.
+
+    Seeds may all lie in one hemisphere, like the seeds of a single continent.
+    They need at least 4 distinct seeds off a common plane, otherwise a
+    ValueError is raised.
+    """
+
+    def __init__(self, points):
+        self.seeds = unit_vectors(points)
+        if len(self.seeds) < 4:
+            raise ValueError("A spherical Voronoi diagram needs at least 4 seeds.")
+
+        # repeated seeds are inserted once, at the row of their first copy, and share a cell
+        _, first, inverse = np.unique(self.seeds, axis=0, return_index=True, return_inverse=True)
+        distinct = np.sort(first)
+        corners = distinct[tetrahedron_seeds(self.seeds[distinct])]
+        self.triangulation = SphericalTriangulation(self.seeds[corners])
+
+        vertex_ids = np.full(len(self.seeds), -1, dtype=np.int64)
+        vertex_ids[corners] = np.arange(4)
+        for i in distinct[sphere_insertion_order(self.seeds[distinct])].tolist():
+            if vertex_ids[i] < 0:
+                vertex_ids[i] = self.triangulation.insert(self.seeds[i])
+        seed_rows = np.empty(len(self.triangulation.points), dtype=np.int64)  # vertex id -> seed row
+        seed_rows[vertex_ids[distinct]] = distinct
+        self.vertex_ids = vertex_ids[first[inverse.reshape(-1)]]  # seed row -> vertex id
+
+        triangle_rows = {t: row for row, t in enumerate(self.triangulation.triangles)}
+        self.triangles = seed_rows[np.array(list(self.triangulation.triangles.values()), dtype=np.int64)]
+
+        a, b, c = (self.seeds[self.triangles[:, k]] for k in range(3))
+        self.vertices = np.cross(b - a, c - a)
+        self.vertices /= np.linalg.norm(self.vertices, axis=1)[:, None]
+
+        # cell of every vertex id once, copied to each seed row using it
+        rings = {}
+        cell_vertices, self.cell_offsets = [], np.zeros(len(self.seeds) + 1, dtype=np.int64)
+        for i, v in enumerate(self.vertex_ids.tolist()):
+            ring = rings.get(v)
+            if ring is None:
+                ring = rings[v] = [triangle_rows[t] for _, t in self.triangulation.ring(v)]
+            cell_vertices.extend(ring)
+            self.cell_offsets[i + 1] = len(cell_vertices)
+        self.cell_vertices = np.array(cell_vertices, dtype=np.int64)
+
+
+    def __len__(self):
+        return len(self.seeds)
+
+
+    def cell(self, i):
+        """(k, 3) unit vector array of cell i."""
+        return self.vertices[self.cell_vertices[self.cell_offsets[i]:self.cell_offsets[i + 1]]]
+
+
+    def cells(self):
+        """Every cell as a (k, 3) unit vector array, in seed order."""
+        return [self.cell(i) for i in range(len(self))]
+
+
+    def cell_areas(self):
+        """(N,) array of the area of every cell, summing to 4 pi over the sphere."""
+        # each cell is a fan of spherical triangles from its seed (van oosterom-strackee)
+        offsets = self.cell_offsets
+        following = np.arange(1, len(self.cell_vertices) + 1)
+        following[offsets[1:] - 1] = offsets[:-1]
+        first = self.vertices[self.cell_vertices]
+        second = first[following]
+        seeds = np.repeat(self.seeds, np.diff(offsets), axis=0)
+
+        triple = np.einsum("ij,ij->i", seeds, np.cross(first, second))
+        below = (1 + np.einsum("ij,ij->i", seeds, first) + np.einsum("ij,ij->i", first, second) +
+                 np.einsum("ij,ij->i", second, seeds))
+        return np.add.reduceat(2 * np.arctan2(triple, below), offsets[:-1])
+
+
+    def lon_lat_cells(self, width=360, height=180, step=2):
+        """
+        Cells as lists of (x, y) tuples on an equirectangular map, the format the plotting code uses.
+
+        Longitude -180..180 maps to x -width / 2..width / 2 and latitude -90..90
+        to y -height / 2..height / 2. A cell across the antimeridian is one
+        polygon reaching past the edge of the map on its seed's side. Edges
+        longer than step degrees get points every step degrees along them.
+        """
+        scale = (width / (2 * math.pi), height / math.pi)
+        step = math.radians(step)
+        return [[tuple(p) for p in (project_cell(self.cell(i), self.seeds[i], step) * scale).tolist()]
+                for i in range(len(self))]
+
+
+    def lon_lat_seeds(self, width=360, height=180):
+        """Seeds as (x, y) tuples on the map of lon_lat_cells."""
+        return [tuple(p) for p in (lon_lat(self.seeds) * (width / 360, height / 180)).tolist()]
+
+
+def generate_spherical_voronoi(num_points, distribution_method="fibonacci", seed=None, projection=None, width=360, height=180):
+    """
+    Generate a Voronoi diagram of seed points on the unit sphere.
+
+    Parameters:
+        num_points (int): Number of seed points, at least 4. Arbitrary seeds (e.g. in
+            one hemisphere) can be passed to SphericalVoronoi directly.
+        distribution_method (str): Method for distributing seed points over the sphere.
+            Options: "fibonacci", "random". Default is "fibonacci".
+        seed (int, optional): Seed for the "random" distribution. Default is None.
+        projection (str, optional): None for the cells as (k, 3) arrays of unit vectors
+            and the seeds as an (N, 3) array, or "lonlat" for both as (x, y) tuples on an
+            equirectangular map of width x height centred on the origin, ready for
+            plot_graphics or export_svg. Default is None.
+
+    Returns:
+        tuple: (cells, seed points) in the chosen projection.
+    """
+    point_generator = PointGenerator(0, 0, num_points, seed=seed)
+    distribution_methods = {
+        "fibonacci": point_generator.fibonacci_sphere_array,
+        "random": point_generator.random_sphere_array,
+    }
+    if distribution_method not in distribution_methods:
+        raise ValueError(f"Invalid distribution method: {distribution_method}. Choose from {list(distribution_methods.keys())}.")
+
+    voronoi = SphericalVoronoi(distribution_methods[distribution_method]())
+    if projection is None:
+        return voronoi.cells(), voronoi.seeds
+    if projection == "lonlat":
+        return voronoi.lon_lat_cells(width, height), voronoi.lon_lat_seeds(width, height)
+    raise ValueError(f"Invalid projection: {projection}. Choose from [None, 'lonlat'].")
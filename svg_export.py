@@ -0,0 +1,242 @@
+import numpy as np
+from voronoi_diagram import VoronoiDiagram
+
+
+# vector output of what plot_graphics draws. primitives are written to the file as
+# they come in, so the cells can be a generator and no document is built in memory
+
+# stroke width, stroke colour and fill of each layer, matching the turtle plot
+LAYER_STYLES = {
+    "voronoi": (5, "black", "none"),
+    "delauney": (3, "green", "none"),
+    "quadrants": (1, "red", "none"),
+    "seeds": (0, "none", "blue"),
+}
+
+
+class SvgWriter:
+    """
+    Streaming SVG writer in world coordinates (y up, like turtle).
+
+    Use as a context manager, open a layer with begin_layer(name) and write
+    polygons, segments or dots into it. Every primitive is formatted and
+    written as soon as it is passed in.
+    """
+
+    def __init__(self, path, extent, width=None, height=None, precision=2):
+        """
+        Parameters:
+        - path: File name to write, or an open text file.
+        - extent: (min_x, min_y, max_x, max_y) of the world area to show.
+        - width, height: Size of the image, default is the extent's size.
+        - precision: Decimal places written for coordinates.
+        """
+        self.path = path
+        self.extent = extent
+        self.width = width
+        self.height = height
+        self.precision = precision
+        self.file = None
+        self.owns_file = False
+
+
+    def __enter__(self):
+        if isinstance(self.path, str):
+            self.file = open(self.path, "w")
+            self.owns_file = True
+        else:
+            self.file = self.path
+
+        min_x, min_y, max_x, max_y = self.extent
+        view_width, view_height = max_x - min_x, max_y - min_y
+        width = view_width if self.width is None else self.width
+        height = view_height if self.height is None else self.height
+
+        # the root group flips y, so the view box spans -max_y to -min_y
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.file.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:g}" height="{height:g}" '
+                        f'viewBox="{min_x:g} {-max_y:g} {view_width:g} {view_height:g}">\n')
+        self.file.write('<g transform="scale(1,-1)" stroke-linejoin="round" stroke-linecap="round">\n')
+        return self
+
+
+    def __exit__(self, *exc):
+        self.file.write("</g>\n</svg>\n")
+        if self.owns_file:
+            self.file.close()
+
+
+    def coordinate(self, x, y):
+        """Format one point."""
+        return f"{x:.{self.precision}f},{y:.{self.precision}f}"
+
+
+    def begin_layer(self, name, stroke_width=None, stroke=None, fill=None):
+        """Open a <g> element for a layer, styled from LAYER_STYLES unless given."""
+        default_width, default_stroke, default_fill = LAYER_STYLES.get(name, (1, "black", "none"))
+        stroke_width = default_width if stroke_width is None else stroke_width
+        stroke = default_stroke if stroke is None else stroke
+        fill = default_fill if fill is None else fill
+        self.file.write(f'<g id="{name}" stroke="{stroke}" stroke-width="{stroke_width:g}" fill="{fill}">\n')
+
+
+    def end_layer(self):
+        self.file.write("</g>\n")
+
+
+    def polygons(self, polygons):
+        """Write each polygon (list of (x, y)) as a <polygon>, returning how many were written."""
+        count = 0
+        for polygon in polygons:
+            if len(polygon):
+                self.file.write('<polygon points="' + " ".join(self.coordinate(x, y) for x, y in polygon) + '"/>\n')
+                count += 1
+        return count
+
+
+    def segments(self, segments, per_path=1000):
+        """Write ((x1, y1), (x2, y2)) segments, per_path of them to each <path>, returning how many were written."""
+        count = 0
+        for (x1, y1), (x2, y2) in segments:
+            if count % per_path == 0:
+                self.file.write('<path d="' if count == 0 else '"/>\n<path d="')
+            self.file.write(f"M{self.coordinate(x1, y1)}L{self.coordinate(x2, y2)}")
+            count += 1
+        if count:
+            self.file.write('"/>\n')
+        return count
+
+
+    def dots(self, points, radius=2.5):
+        """Write a <circle> per point, returning how many were written."""
+        count = 0
+        for x, y in points:
+            self.file.write(f'<circle cx="{x:.{self.precision}f}" cy="{y:.{self.precision}f}" r="{radius:g}"/>\n')
+            count += 1
+        return count
+
+
+def shared_edges(diagram):
+    """
+    Every edge of a VoronoiDiagram once, as an (E, 2) array of vertex indices.
+
+    Neighbouring cells store their common edge with the same welded vertex
+    indices, so ordering each pair and dropping repeats leaves one copy.
+    """
+    offsets, indices = diagram.cell_offsets, diagram.cell_vertices
+    counts = np.diff(offsets)
+    filled = counts > 0
+    following = np.arange(1, len(indices) + 1)
+    following[offsets[1:][filled] - 1] = offsets[:-1][filled]
+
+    a, b = indices, indices[following]
+    edges = np.column_stack((np.minimum(a, b), np.maximum(a, b)))
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    key = np.unique(edges[:, 0] * len(diagram.vertices) + edges[:, 1])
+    return np.column_stack((key // len(diagram.vertices), key % len(diagram.vertices)))
+
+
+def edge_chains(edges, num_vertices):
+    """
+    Join (E, 2) edges into polylines that use every edge once.
+
+    Yields lists of vertex indices. Walks start at odd degree vertices first (the
+    ends any chain cover needs), so the chains come out long and every shared
+    vertex is written about once instead of once per cell.
+    """
+    # both directions of every edge grouped by start vertex (CSR), half edge 2e and 2e + 1 belong to edge e
+    sources = np.concatenate((edges[:, 0], edges[:, 1]))
+    targets = np.concatenate((edges[:, 1], edges[:, 0]))
+    order = np.argsort(sources, kind="stable")
+    degree = np.bincount(sources, minlength=num_vertices)
+    offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(degree, out=offsets[1:])
+
+    targets = targets[order].tolist()
+    edge_of = (order % len(edges)).tolist()
+    cursor = offsets[:-1].tolist()  # next half edge of each vertex still to look at
+    ends = offsets[1:].tolist()
+    used = bytearray(len(edges))
+
+    starts = np.concatenate((np.flatnonzero(degree % 2 == 1), np.flatnonzero(degree % 2 == 0))).tolist()
+    for start in starts:
+        while True:
+            chain, u = [start], start
+            while True:
+                # skip the half edges whose edge was already walked
+                while cursor[u] < ends[u] and used[edge_of[cursor[u]]]:
+                    cursor[u] += 1
+                if cursor[u] == ends[u]:
+                    break
+                used[edge_of[cursor[u]]] = 1
+                u = targets[cursor[u]]
+                chain.append(u)
+            if len(chain) == 1:
+                break
+            yield chain
+
+
+def write_shared_edges(writer, diagram, per_path=1000):
+    """Write every edge of a VoronoiDiagram once, as polylines with each vertex formatted a single time."""
+    vertices = [writer.coordinate(x, y) for x, y in diagram.vertices.tolist()]
+    count, parts = 0, []
+    for chain in edge_chains(shared_edges(diagram), len(vertices)):
+        parts.append("M" + vertices[chain[0]] + "L" + " ".join(vertices[v] for v in chain[1:]))
+        count += len(chain) - 1
+        if len(parts) == per_path:
+            writer.file.write('<path d="' + "".join(parts) + '"/>\n')
+            parts = []
+    if parts:
+        writer.file.write('<path d="' + "".join(parts) + '"/>\n')
+    return count
+
+
+def quadrant_square(quadrant):
+    """Four corners of a quadrant square (as compute_square_vertices in the plotting code)."""
+    x, y = quadrant.midpoint
+    size = quadrant.length / 2
+    return [(x - size, y - size), (x + size, y - size), (x + size, y + size), (x - size, y + size)]
+
+
+def export_svg(path, voronoi_data=None, seed_points=None, quadrants=None, delauney_triangles=None,
+               merge_edges=False, extent=None, precision=2):
+    """
+    Write the layers plot_graphics draws to an SVG file.
+
+    voronoi_data and delauney_triangles may be generators (streamed), in which
+    case extent (min_x, min_y, max_x, max_y) must be given. merge_edges writes
+    each voronoi edge once from a VoronoiDiagram instead of every cell outline,
+    which needs the cells as a list or a VoronoiDiagram. Layers are written
+    bottom to top: voronoi, quadrants, delauney, seeds.
+    """
+    if extent is None:
+        if not isinstance(voronoi_data, (list, tuple, VoronoiDiagram)):
+            raise ValueError("extent is required when voronoi_data is not a list or VoronoiDiagram.")
+        vertices = (voronoi_data.vertices if isinstance(voronoi_data, VoronoiDiagram)
+                    else np.array([v for cell in voronoi_data for v in cell], dtype=np.float64).reshape(-1, 2))
+        extent = (*vertices.min(axis=0), *vertices.max(axis=0))
+
+    with SvgWriter(path, extent, precision=precision) as writer:
+        if voronoi_data is not None:
+            writer.begin_layer("voronoi")
+            if merge_edges:
+                diagram = voronoi_data if isinstance(voronoi_data, VoronoiDiagram) else VoronoiDiagram.from_cells(voronoi_data, [], decimals=precision)
+                write_shared_edges(writer, diagram)
+            else:
+                writer.polygons(voronoi_data.to_list() if isinstance(voronoi_data, VoronoiDiagram) else voronoi_data)
+            writer.end_layer()
+
+        if quadrants is not None:
+            writer.begin_layer("quadrants")
+            writer.polygons(quadrant_square(q) for q in quadrants.flatten().tolist())
+            writer.end_layer()
+
+        if delauney_triangles is not None:
+            writer.begin_layer("delauney")
+            writer.polygons(delauney_triangles)
+            writer.end_layer()
+
+        if seed_points is not None:
+            writer.begin_layer("seeds")
+            writer.dots(seed_points)
+            writer.end_layer()
@@ -0,0 +1,20 @@
+from voronoi_cells import generate_voronoi_and_delauney
+from voronoi_diagram import VoronoiDiagram
+
+
+def diagram(num_points, delauney=False):
+    cells, seeds, triangles = generate_voronoi_and_delauney(400, 400, num_points)
+    result = VoronoiDiagram.from_cells(cells, seeds)
+    return result.set_delauney(triangles) if delauney else result
+
+
+def test_save_twice_into_one_directory(tmp_path):
+    diagram(50, delauney=True).save(tmp_path)
+    diagram(10).save(tmp_path)
+
+    loaded = VoronoiDiagram.load(tmp_path)
+    assert len(loaded.seeds) == 10
+    assert len(loaded) == 10
+    assert loaded.triangles is None
+    assert loaded.neighbour_offsets is None
+    assert loaded.neighbours is None
@@ -1,6 +1,115 @@
+import heapq
+import math
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from voronoi_diagram import VertexWelder, VoronoiDiagram, canonical_start
+
+# per process state for parallel cell computation, set once by init_cell_worker
+worker_state = {}
+
+
+def init_cell_worker(generator_class, generator_kwargs, seeds_name, num_seeds, region_name, num_region, lazy_boundary=False):
+    """Attach a pool worker to the shared seed and bounding region arrays."""
+    seeds_memory = shared_memory.SharedMemory(name=seeds_name)
+    region_memory = shared_memory.SharedMemory(name=region_name)
+    seeds = np.ndarray((num_seeds, 2), dtype=np.float64, buffer=seeds_memory.buf)
+    region = np.ndarray((num_region, 2), dtype=np.float64, buffer=region_memory.buf)
+
+    points = [tuple(p) for p in seeds.tolist()]
+    worker_state["memory"] = (seeds_memory, region_memory)  # keep the segments mapped
+    worker_state["points"] = points
+    worker_state["region"] = [tuple(v) for v in region.tolist()]
+    worker_state["generator"] = generator_class(points, **generator_kwargs)
+    worker_state["generator"].lazy_boundary = lazy_boundary
+
+
+def compute_cell_chunk(bounds):
+    """Compute the cells of seeds[start:stop] inside a pool worker."""
+    start, stop = bounds
+    generator, region = worker_state["generator"], worker_state["region"]
+    return [generator.bounded_cell(p, region) for p in worker_state["points"][start:stop]]
+
+
+class RegionClearance:
+    """
+    How far points are from the edge of a bounding region (any simple polygon).
+
+    A coarse grid over the region's bounding box stores lower and upper bounds
+    of the signed distance to the boundary for every grid square, so most
+    points are answered with one lookup and only points near the boundary are
+    measured against every edge.
+    """
+
+    def __init__(self, region, resolution=64):
+        self.region = region
+        vertices = np.asarray(region, dtype=np.float64).reshape(-1, 2)
+        self.starts, self.ends = vertices, np.roll(vertices, -1, axis=0)
+        self.min_x, self.min_y = vertices.min(axis=0).tolist()
+        self.max_x, self.max_y = vertices.max(axis=0).tolist()
+        self.size = max(self.max_x - self.min_x, self.max_y - self.min_y, 1e-12) / resolution
+        self.resolution = resolution
+
+        # cells come out in the region's vertex order, clockwise regions give clockwise cells
+        x, y = vertices[:, 0], vertices[:, 1]
+        self.clockwise = float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) < 0
+
+        # convex when every corner turns the same way, collinear corners aside
+        edges = self.ends - self.starts
+        turns = edges[:, 0] * np.roll(edges[:, 1], -1) - edges[:, 1] * np.roll(edges[:, 0], -1)
+        turns = turns[np.abs(turns) > 1e-12 * max(float(np.abs(edges).max(initial=0.0)), 1e-300) ** 2]
+        self.convex = bool((turns > 0).all() or (turns < 0).all())
+
+        # signed distance of every square centre, give or take half a diagonal, bounds the whole square
+        steps = (np.arange(resolution) + 0.5) * self.size
+        centre_x, centre_y = np.meshgrid(self.min_x + steps, self.min_y + steps)
+        centres = np.column_stack((centre_x.ravel(), centre_y.ravel()))
+        distances = self.signed_distances(centres).reshape(resolution, resolution)
+        self.lower = (distances - self.size * math.sqrt(0.5)).tolist()
+        self.upper = (distances + self.size * math.sqrt(0.5)).tolist()
+
+
+    def signed_distances(self, points, chunk=256):
+        """Distance from each of an (M, 2) array of points to the region boundary, negative outside."""
+        distance = np.full(len(points), np.inf)
+        inside = np.zeros(len(points), dtype=bool)
+        for first in range(0, len(self.starts), chunk):
+            (x1, y1), (x2, y2) = self.starts[first:first + chunk].T, self.ends[first:first + chunk].T
+            px, py = points[:, 0, None], points[:, 1, None]
+
+            # nearest point on every edge
+            dx, dy = x2 - x1, y2 - y1
+            t = np.clip(((px - x1) * dx + (py - y1) * dy) / np.maximum(dx * dx + dy * dy, 1e-300), 0.0, 1.0)
+            np.minimum(distance, np.hypot(px - x1 - t * dx, py - y1 - t * dy).min(axis=1), out=distance)
+
+            # even-odd rule: count the edges crossed by a ray to the right
+            straddles = (y1 > py) != (y2 > py)
+            crossing_x = x1 + (py - y1) * dx / np.where(straddles, y2 - y1, 1.0)
+            inside ^= (straddles & (px < crossing_x)).sum(axis=1) % 2 == 1
+        return np.where(inside, distance, -distance)
+
+
+    def contains_disc(self, p, radius):
+        """True if the disc of the given radius around p lies inside the region."""
+        column = int((p[0] - self.min_x) // self.size)
+        row = int((p[1] - self.min_y) // self.size)
+        if not (0 <= column < self.resolution and 0 <= row < self.resolution):
+            return False  # outside the bounding box
+        if self.lower[row][column] > radius:
+            return True
+        if self.upper[row][column] <= radius:
+            return False
+        return self.signed_distances(np.array([p], dtype=np.float64))[0] > radius
+
 
 class VoronoiGenerator:
+    # engines that compute each cell independently can spread seeds over worker processes
+    supports_workers = True
+
+    # clip cells against a small box around their seed first and only boundary cells
+    # against the bounding region, see bounded_cell. off unless set on the instance
+    lazy_boundary = False
+
     def __init__(self, points, padding=10, bounding_shape="rectangle", custom_shape=None):
         """
         Initialize VoronoiGenerator.
@@ -15,6 +124,8 @@ class VoronoiGenerator:
         self.padding = padding
         self.bounding_shape = bounding_shape.lower()  # Normalize input
         self.custom_shape = custom_shape  # Stores user-defined polygon
+        self.clearance = None  # RegionClearance of the last bounding region used by lazy_cell
+        self.half_width = None  # starting half width of its boxes
 
 
     def compute_intersection(self, p1, p2, f):
@@ -48,10 +159,10 @@ class VoronoiGenerator:
         return clipped
 
 
-    def compute_voronoi_cell(self, p, bounding_region):
-        """Compute the Voronoi cell for a given point."""
+    def compute_voronoi_cell(self, p, bounding_region, neighbours=None):
+        """Compute the Voronoi cell for a given point, optionally clipping against only its neighbouring seeds."""
         cell = bounding_region[:]
-        for q in self.points:
+        for q in (self.points if neighbours is None else neighbours):
             if p == q:
                 continue
             mx, my = (p[0] + q[0]) / 2.0, (p[1] + q[1]) / 2.0
@@ -62,8 +173,103 @@ class VoronoiGenerator:
         return cell
 
 
-    def voronoi_cells(self):
-        """Compute Voronoi cells based on bounding shape."""
+    def bounded_cell(self, p, bounding_region, neighbours=None):
+        """
+        The Voronoi cell of p inside bounding_region.
+
+        This is compute_voronoi_cell, unless uses_lazy_cell: then see lazy_cell.
+        """
+        if not self.uses_lazy_cell(bounding_region):
+            return self.compute_voronoi_cell(p, bounding_region, neighbours)
+        return self.lazy_cell(p, bounding_region, lambda region: self.compute_voronoi_cell(p, region, neighbours))
+
+
+    def uses_lazy_cell(self, bounding_region):
+        """
+        True if lazy_boundary is set and lazy_cell gives the same cells as clipping bounding_region directly.
+
+        Regions of up to four vertices are no more work to clip than a box, so
+        they are always clipped directly. So are non-convex regions: clipping
+        one bisector at a time can leave the pieces of a cell joined along the
+        bisectors, which lazy_cell's single clip against the finished cell does not.
+        """
+        if not self.lazy_boundary or len(bounding_region) <= 4:
+            return False
+        return self.region_clearance(bounding_region).convex
+
+
+    def region_clearance(self, bounding_region):
+        """RegionClearance of bounding_region, built once and kept for the next cell in the same region."""
+        if self.clearance is None or self.clearance.region is not bounding_region:
+            self.clearance = RegionClearance(bounding_region)
+            self.half_width = self.local_box_size()
+        return self.clearance
+
+
+    def local_box_size(self):
+        """Starting half width of the boxes lazy_cell clips cells from: twice the average seed spacing."""
+        xs, ys = [p[0] for p in self.points], [p[1] for p in self.points]
+        area = max((max(xs) - min(xs)) * (max(ys) - min(ys)), max(max(xs) - min(xs), max(ys) - min(ys)) ** 2 / len(xs))
+        return 2 * math.sqrt(area / len(xs)) or self.padding
+
+
+    def box(self, min_x, min_y, max_x, max_y):
+        """Rectangle polygon, in the same rotational direction as the bounding region."""
+        box = [(min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y)]
+        return box[::-1] if self.clearance.clockwise else box
+
+
+    def lazy_cell(self, p, bounding_region, compute):
+        """
+        Cell of p from compute(region), without clipping every bisector against bounding_region.
+
+        The cell is first clipped from a square box around p, twice as large each
+        time the cell reaches the box, as long as the box fits in the region. A
+        cell that ends inside a box is the seed's complete Voronoi cell. Once the box
+        would leave the region, the region's bounding box is used instead, which
+        holds the cell inside the region too. The result is the answer if it
+        keeps clear of the region boundary, so the region's vertices never take
+        part for interior cells. Only boundary cells clip the region, and then
+        against the few edges of the finished cell rather than every bisector.
+        bounding_region must be convex, see uses_lazy_cell.
+        """
+        self.region_clearance(bounding_region)
+
+        x, y = p
+        half_width = self.half_width
+        while self.clearance.contains_disc(p, half_width * math.sqrt(2)):
+            cell = compute(self.box(x - half_width, y - half_width, x + half_width, y + half_width))
+
+            # a cell with no vertex on the box sides ends inside the box, and so inside the region
+            if cell and max(max(abs(vx - x), abs(vy - y)) for vx, vy in cell) < half_width * (1 - 1e-9):
+                return cell
+            half_width *= 2
+
+        clearance = self.clearance
+        cell = compute(self.box(clearance.min_x, clearance.min_y, clearance.max_x, clearance.max_y))
+        if cell and clearance.contains_disc(p, max(math.dist(p, vertex) for vertex in cell)):
+            return cell
+        return self.clip_to_cell(bounding_region, cell)
+
+
+    def clip_to_cell(self, polygon, cell):
+        """Clip a polygon against every edge of a convex cell."""
+        if len(cell) < 3:
+            return []
+        # the vertex mean is inside the cell, even when its seed is not
+        cx, cy = sum(v[0] for v in cell) / len(cell), sum(v[1] for v in cell) / len(cell)
+        cell = list(cell)
+        for (ax, ay), (bx, by) in zip(cell, cell[1:] + cell[:1]):
+            # keep the side of the edge line the cell is on
+            side = 1.0 if (bx - ax) * (cy - ay) - (by - ay) * (cx - ax) >= 0 else -1.0
+            def half_plane(x, y, ax=ax, ay=ay, dx=(bx - ax) * side, dy=(by - ay) * side):
+                return dx * (y - ay) - dy * (x - ax)
+            polygon = self.clip_polygon(polygon, half_plane)
+        return polygon
+
+
+    def compute_bounding_region(self):
+        """Compute the bounding polygon for the selected bounding shape."""
         
         if self.bounding_shape == "rectangle":
             min_x, max_x = min(p[0] for p in self.points) - self.padding, max(p[0] for p in self.points) + self.padding
@@ -100,23 +306,542 @@ class VoronoiGenerator:
         else:
             raise ValueError(f"Unsupported bounding shape: {self.bounding_shape}")
 
+        return bounding_region
+
+
+    def iter_voronoi_cells(self, bounding_region):
+        """Yield the Voronoi cell of every seed, in seed order."""
+        for p in self.points:
+            yield self.bounded_cell(p, bounding_region)
+
+
+    def voronoi_cells(self, workers=None):
+        """Compute Voronoi cells based on bounding shape, optionally across a pool of worker processes."""
+        bounding_region = self.compute_bounding_region()
+
+        if self.supports_workers and workers is not None and workers > 1 and len(self.points) > 1:
+            return self.parallel_voronoi_cells(bounding_region, workers)
+
         # Compute Voronoi cells
-        return {p: self.compute_voronoi_cell(p, bounding_region) for p in self.points}
+        return dict(zip(self.points, self.iter_voronoi_cells(bounding_region)))
+
+
+    def voronoi_diagram(self, workers=None):
+        """Compute the Voronoi cells straight into a compact VoronoiDiagram, without the cells dict."""
+        bounding_region = self.compute_bounding_region()
+
+        # duplicate seeds keep one cell each (the first seed index), as in the cells dict
+        seed_index = {}
+        for i, p in enumerate(self.points):
+            seed_index.setdefault(p, i)
+
+        if self.supports_workers and workers is not None and workers > 1 and len(self.points) > 1:
+            cells = self.parallel_voronoi_cells(bounding_region, workers).values()
+        else:
+            cells = (cell for i, (p, cell) in enumerate(zip(self.points, self.iter_voronoi_cells(bounding_region)))
+                     if seed_index[p] == i)
+        return VoronoiDiagram.from_cells(cells, self.points, seed_index=list(seed_index.values()))
+
+
+    def parallel_voronoi_cells(self, bounding_region, workers, chunks_per_worker=4):
+        """
+        Compute Voronoi cells in a ProcessPoolExecutor.
+
+        Seeds and bounding region are copied once into shared memory that every
+        worker attaches to, tasks only carry (start, stop) seed ranges, and
+        chunks are merged back in seed order so the result matches voronoi_cells.
+        """
+        seeds = np.asarray(self.points, dtype=np.float64).reshape(-1, 2)
+        region = np.asarray(bounding_region, dtype=np.float64).reshape(-1, 2)
+        seeds_memory = shared_memory.SharedMemory(create=True, size=seeds.nbytes)
+        region_memory = shared_memory.SharedMemory(create=True, size=region.nbytes)
+
+        try:
+            np.ndarray(seeds.shape, dtype=np.float64, buffer=seeds_memory.buf)[:] = seeds
+            np.ndarray(region.shape, dtype=np.float64, buffer=region_memory.buf)[:] = region
+
+            # the bounding region travels through shared memory, not the custom shape
+            generator_kwargs = {"padding": self.padding, "bounding_shape": self.bounding_shape, "custom_shape": None}
+            initargs = (type(self), generator_kwargs, seeds_memory.name, len(seeds), region_memory.name, len(region),
+                        self.lazy_boundary)
+
+            step = max(1, -(-len(seeds) // (workers * chunks_per_worker)))
+            chunks = [(start, min(start + step, len(seeds))) for start in range(0, len(seeds), step)]
+
+            with ProcessPoolExecutor(workers, initializer=init_cell_worker, initargs=initargs) as executor:
+                cells = [cell for chunk in executor.map(compute_cell_chunk, chunks) for cell in chunk]
+        finally:
+            seeds_memory.close()
+            seeds_memory.unlink()
+            region_memory.close()
+            region_memory.unlink()
+
+        return dict(zip(self.points, cells))
+
+
+    def remove_duplicate_vertices(self, cell, welder=None):
+        """Remove duplicate or near-identical vertices, welding through welder (a fresh VertexWelder when None)."""
+        welder = VertexWelder() if welder is None else welder
+        return [welder.vertices[v] for v in welder.weld_cell(cell)]
+
+
+    def canonical_rotation(self, cell):
+        """Rotate a cell to start at its lowest (then leftmost) vertex, so every engine lists it the same way."""
+        start = canonical_start(cell)
+        return cell[start:] + cell[:start]
+
+
+    def dictionary_to_list(self, cells_dict, welder=None):
+        """
+        Convert dictionary format into a list of vertex sets.
+
+        All cells are welded through one VertexWelder, so a vertex shared by
+        neighbouring cells comes out as the same tuple in every one of them.
+        """
+        welder = VertexWelder() if welder is None else welder
+        return [self.canonical_rotation(self.remove_duplicate_vertices(vertices, welder))
+                for vertices in cells_dict.values()]
+
+
+class NumpyVoronoiGenerator(VoronoiGenerator):
+    """
+    Array based clipping engine.
+
+    Seeds are held as an (N, 2) array and every bisector of a cell is evaluated
+    with array operations instead of one Python closure per seed. Half-planes
+    are still applied in seed order and a bisector that leaves the polygon
+    untouched rotates it by one vertex exactly like clip_polygon does, so the
+    cells (and dictionary_to_list output) match VoronoiGenerator.
+    """
+
+    # bounds on the number of bisectors tested against the current polygon per array pass
+    min_block_size = 16
+    max_block_size = 4096
+
+    def __init__(self, points, padding=10, bounding_shape="rectangle", custom_shape=None):
+        super().__init__(points, padding, bounding_shape, custom_shape)
+        self.seeds = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+    def clip_polygon_array(self, polygon, f, start=0):
+        """
+        Clip an (k, 2) polygon against the half-plane f >= 0 given f at every vertex.
+
+        The polygon is walked from vertex `start` onwards, which is how a run of
+        non-cutting bisectors leaves it rotated before this clip.
+        """
+        order = np.arange(start, start + len(polygon)) % len(polygon)
+        polygon, f = polygon[order], f[order]
+        next_polygon = np.concatenate((polygon[1:], polygon[:1]))
+        next_f = np.concatenate((f[1:], f[:1]))
+        inside, inside_next = f >= 0, next_f >= 0
+
+        # intersection of every edge that crosses the boundary (same formula as compute_intersection)
+        crossing = inside != inside_next
+        t = f / np.where(crossing, f - next_f, 1.0)
+        intersection = polygon + t[:, None] * (next_polygon - polygon)
+
+        # each edge emits up to two vertices, in the order clip_polygon appends them
+        emitted = np.empty((len(polygon), 2, 2))
+        emitted[:, 0] = np.where((inside & inside_next)[:, None], next_polygon, intersection)
+        emitted[:, 1] = next_polygon
+        keep = np.empty((len(polygon), 2), dtype=bool)
+        keep[:, 0] = inside | inside_next
+        keep[:, 1] = crossing & inside_next
+        return emitted[keep]
+
+
+    def compute_voronoi_cell(self, p, bounding_region, neighbours=None):
+        """Compute the Voronoi cell for a given point, optionally clipping against only its neighbouring seeds."""
+        cell = np.array(bounding_region, dtype=np.float64).reshape(-1, 2)
+
+        seeds = self.seeds if neighbours is None else np.asarray(neighbours, dtype=np.float64).reshape(-1, 2)
+        others = seeds[(seeds[:, 0] != p[0]) | (seeds[:, 1] != p[1])]
+        mx, my = (p[0] + others[:, 0]) / 2.0, (p[1] + others[:, 1]) / 2.0
+        nx, ny = p[0] - others[:, 0], p[1] - others[:, 1]
+
+        # bisectors that do not cut the polygon only rotate it, so count them up.
+        # the pass size grows while nothing cuts and shrinks back after a cut
+        position, rotation, block_size = 0, 0, self.min_block_size
+        while position < len(others) and len(cell):
+            block = slice(position, position + block_size)
+            f = ((cell[:, 0, None] - mx[block]) * nx[block] +
+                 (cell[:, 1, None] - my[block]) * ny[block])
+            cuts = (f < 0).any(axis=0)
+            j = int(cuts.argmax())
+
+            if not cuts[j]:
+                rotation += f.shape[1]
+                position += f.shape[1]
+                block_size = min(2 * block_size, self.max_block_size)
+                continue
+
+            cell = self.clip_polygon_array(cell, f[:, j], (rotation + j) % len(cell))
+            rotation = 0
+            position += j + 1
+            block_size = max(2 * (j + 1), self.min_block_size)
+
+        if len(cell):
+            cell = cell[np.arange(rotation, rotation + len(cell)) % len(cell)]
+        return [tuple(vertex) for vertex in cell.tolist()]
+
+
+class BeachArc:
+    """A parabolic arc on the Fortune beach line, belonging to one site."""
+    __slots__ = ("site", "event")
+
+    def __init__(self, site):
+        self.site = site
+        self.event = None  # pending circle event that would remove this arc
+
+
+class FortuneVoronoiGenerator(VoronoiGenerator):
+    """
+    Sweep line engine.
+
+    Fortune's algorithm sweeps the seeds in order of increasing y, keeping the
+    beach line as an x ordered list of arcs and the site / circle events in a
+    priority queue. Two arcs become adjacent exactly when their seeds are
+    Delaunay neighbours, so the sweep yields every cell's neighbours in
+    O(n log n). Each cell is then clipped from the bounding region against those
+    few bisectors only, which keeps "rectangle", "circle", "triangle" and
+    "custom" regions working exactly as they do for VoronoiGenerator.
+    """
+
+    # the sweep is serial, workers= is ignored
+    supports_workers = False
+
+    def __init__(self, points, padding=10, bounding_shape="rectangle", custom_shape=None):
+        super().__init__(points, padding, bounding_shape, custom_shape)
+        self.triangles = []  # Delaunay triangles (site index triples) found by circle events
+
+
+    @staticmethod
+    def breakpoint(left, right, sweep_y):
+        """x coordinate where the arc of `left` meets the arc of `right` with the sweep line at sweep_y."""
+        (lx, ly), (rx, ry) = left, right
+        if ly == ry:
+            return (lx + rx) / 2.0
+        if ly == sweep_y:
+            return lx
+        if ry == sweep_y:
+            return rx
+
+        # solve y_left(x) == y_right(x) in coordinates relative to the left focus
+        dl, dr = 2.0 * (ly - sweep_y), 2.0 * (ry - sweep_y)
+        dx = rx - lx
+        a = 1.0 / dl - 1.0 / dr
+        b = 2.0 * dx / dr
+        c = (ly - ry) / 2.0 - dx * dx / dr
+        root = math.sqrt(max(b * b - 4.0 * a * c, 0.0))
+
+        # the left arc is above before the crossing and the right arc after it
+        if b <= 0:
+            return lx + 2.0 * c / (root - b) if root - b else (lx + rx) / 2.0
+        if a == 0:
+            return lx - c / b
+        return lx - (b + root) / (2.0 * a)
+
+
+    def locate_arc(self, beach, sites, x, sweep_y):
+        """Index of the beach line arc above x."""
+        lo, hi = 0, len(beach) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.breakpoint(sites[beach[mid].site], sites[beach[mid + 1].site], sweep_y) < x:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+    def check_circle_event(self, beach, sites, i, sweep_y, events, counter):
+        """Queue the circle event that removes arc i, if its breakpoints converge."""
+        if i <= 0 or i >= len(beach) - 1:
+            return
+        a, b, c = beach[i - 1].site, beach[i].site, beach[i + 1].site
+        if a == c:
+            return
+
+        (ax, ay), (bx, by), (cx, cy) = sites[a], sites[b], sites[c]
+        bax, bay, cax, cay = bx - ax, by - ay, cx - ax, cy - ay
+        d = 2.0 * (bax * cay - bay * cax)
+
+        # breakpoints only converge when a, b, c turn counter-clockwise
+        if d <= 0:
+            return
+
+        ux = (cay * (bax * bax + bay * bay) - bay * (cax * cax + cay * cay)) / d
+        uy = (bax * (cax * cax + cay * cay) - cax * (bax * bax + bay * bay)) / d
+        event_y = ay + uy + math.hypot(ux, uy)
+        if event_y < sweep_y:
+            return
+
+        event = [event_y, ax + ux, next(counter), beach[i]]
+        beach[i].event = event
+        heapq.heappush(events, event)
+
+
+    def delauney_neighbours(self, sites):
+        """Run the sweep over distinct sites and return each site's set of Delaunay neighbours."""
+        neighbours = [set() for _ in sites]
+        self.triangles = []
+        order = sorted(range(len(sites)), key=lambda i: (sites[i][1], sites[i][0]))
+        beach, events = [], []
+        counter = iter(range(1 << 62))
+
+        def join(i, j):
+            neighbours[i].add(j)
+            neighbours[j].add(i)
+
+        next_site = 0
+        while next_site < len(order) or events:
+            # circle events fire before a site event at the same height
+            if events and (next_site == len(order) or events[0][0] <= sites[order[next_site]][1]):
+                event = heapq.heappop(events)
+                event_y, event_x, _, arc = event
+                if arc.event is not event:
+                    continue  # invalidated since it was queued
+
+                # find the arc that disappears, ties between zero length arcs are resolved by identity
+                i = self.locate_arc(beach, sites, event_x, event_y)
+                i = next(j for d in range(len(beach))
+                         for j in (i - d, i + d) if 0 <= j < len(beach) and beach[j] is arc)
+
+                left, right = beach[i - 1], beach[i + 1]
+                self.triangles.append((left.site, arc.site, right.site))
+                join(left.site, right.site)
+                for neighbour in (left, right):
+                    neighbour.event = None
+                del beach[i]
+
+                self.check_circle_event(beach, sites, i - 1, event_y, events, counter)
+                self.check_circle_event(beach, sites, i, event_y, events, counter)
+                continue
+
+            s = order[next_site]
+            next_site += 1
+            sx, sy = sites[s]
+            if not beach:
+                beach.append(BeachArc(s))
+                continue
+
+            i = self.locate_arc(beach, sites, sx, sy)
+            t = beach[i].site
+            join(s, t)
+
+            if sites[t][1] == sy:
+                # only sites on the first row are on the beach line yet, arcs sit side by side
+                i += sites[t][0] < sx
+                beach.insert(i, BeachArc(s))
+                for j in (i - 1, i + 1):
+                    if 0 <= j < len(beach):
+                        join(s, beach[j].site)
+                continue
+
+            # split the arc above the new site into left part, new arc, right part
+            beach[i].event = None
+            beach[i:i + 1] = [BeachArc(t), BeachArc(s), BeachArc(t)]
+            self.check_circle_event(beach, sites, i, sy, events, counter)
+            self.check_circle_event(beach, sites, i + 2, sy, events, counter)
+
+        return neighbours
+
+
+    def iter_voronoi_cells(self, bounding_region):
+        """Sweep once, then yield the Voronoi cell of every seed in seed order."""
+
+        # duplicate seeds share one site on the sweep
+        site_index = {}
+        for p in self.points:
+            site_index.setdefault(p, len(site_index))
+        sites = list(site_index)
+        neighbours = self.delauney_neighbours([(float(x), float(y)) for x, y in sites])
+
+        # Compute Voronoi cells, each against its neighbours in seed order
+        for p in self.points:
+            yield self.bounded_cell(p, bounding_region, [sites[j] for j in sorted(neighbours[site_index[p]])])
+
+
+class SeedGrid:
+    """Uniform bucket grid over the seed points for nearest-first neighbour queries."""
+
+    def __init__(self, points, seeds_per_bucket=2):
+        xs, ys = [p[0] for p in points], [p[1] for p in points]
+        self.min_x, self.min_y = min(xs), min(ys)
+        width, height = max(xs) - self.min_x, max(ys) - self.min_y
+
+        # bucket width for about seeds_per_bucket seeds each, also when the seeds are collinear
+        self.size = max(math.sqrt(width * height * seeds_per_bucket / len(points)),
+                        max(width, height) * seeds_per_bucket / len(points)) or 1.0
+
+        self.buckets = {}
+        for i, p in enumerate(points):
+            self.buckets.setdefault(self.bucket(p), []).append((i, p))
+        self.max_ring = max(max(abs(u), abs(v)) for u, v in self.buckets) + 1
+
+
+    def bucket(self, p):
+        """(u, v) bucket containing point p."""
+        return int((p[0] - self.min_x) // self.size), int((p[1] - self.min_y) // self.size)
+
+
+    def ring(self, u, v, r):
+        """Buckets at Chebyshev distance r from bucket (u, v)."""
+        if r == 0:
+            return [(u, v)]
+        top_bottom = [(i, j) for i in range(u - r, u + r + 1) for j in (v - r, v + r)]
+        sides = [(i, j) for i in (u - r, u + r) for j in range(v - r + 1, v + r)]
+        return top_bottom + sides
+
+
+    def nearest(self, p):
+        """Yield (distance, point) for every seed in order of increasing distance from p."""
+        u, v = self.bucket(p)
+        reach = self.max_ring + max(abs(u), abs(v))
+        candidates = []
+        for r in range(reach + 1):
+            for key in self.ring(u, v, r):
+                for i, q in self.buckets.get(key, ()):
+                    heapq.heappush(candidates, (math.dist(p, q), i, q))
+
+            # seeds in rings further out are at least r bucket widths away
+            while candidates and (candidates[0][0] <= r * self.size or r == reach):
+                distance, _, q = heapq.heappop(candidates)
+                yield distance, q
+
+
+class GridVoronoiGenerator(VoronoiGenerator):
+    """
+    Spatially pruned clipping engine.
+
+    Seeds are bucketed in a SeedGrid and each cell is clipped against
+    candidates in order of increasing distance. A seed further than twice the
+    largest distance from p to the current cell vertices cannot cut the cell,
+    so the search stops there and per cell work stays roughly constant on
+    evenly spread seeds.
+    """
+
+    def __init__(self, points, padding=10, bounding_shape="rectangle", custom_shape=None):
+        super().__init__(points, padding, bounding_shape, custom_shape)
+        self.grid = SeedGrid(points)
+
+
+    def compute_voronoi_cell(self, p, bounding_region, neighbours=None):
+        """Compute the Voronoi cell for a given point, visiting the nearest seeds first."""
+        if neighbours is not None:
+            return super().compute_voronoi_cell(p, bounding_region, neighbours)
+
+        cell = bounding_region[:]
+        radius = max(math.dist(p, v) for v in cell)
+        for distance, q in self.grid.nearest(p):
+            # security radius: no further seed's bisector reaches the cell
+            if distance > 2 * radius:
+                break
+            if p == q:
+                continue
+            cell = super().compute_voronoi_cell(p, cell, [q])
+            if not cell:
+                break
+            radius = max(math.dist(p, v) for v in cell)
+        return cell
+
+
+class TiledVoronoiGenerator(VoronoiGenerator):
+    """
+    Streaming engine over square tiles of seeds.
+
+    Each tile's cells are clipped against the seeds of the tile and a halo of
+    surrounding tiles, nearest first. A seed outside the searched block lies
+    further than the gap from p to the block edge, so once that gap exceeds
+    twice the largest distance from p to the cell vertices no other bisector
+    can cut the cell and the halo is only grown for cells that fail this check.
+    The cells are identical to VoronoiGenerator's after dictionary_to_list.
+
+    iter_tiles yields the cells tile by tile, so only one tile of cells is
+    held at a time. The seeds are not streamed: they and the tile grid over
+    them are held in full, so memory is still O(N) in the number of seeds.
+    """
+
+    def __init__(self, points, padding=10, bounding_shape="rectangle", custom_shape=None, seeds_per_tile=64, halo=1):
+        super().__init__(points, padding, bounding_shape, custom_shape)
+        self.halo = halo
+        self.seeds = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.tiles = SeedGrid(points, seeds_per_bucket=seeds_per_tile)
+        self.max_u = max(u for u, _ in self.tiles.buckets)
+        self.max_v = max(v for _, v in self.tiles.buckets)
+
+
+    def candidates(self, u, v, h):
+        """Seed indices in the tiles within h of tile (u, v), in seed order."""
+        indices = [i for key in ((i, j) for i in range(u - h, u + h + 1) for j in range(v - h, v + h + 1))
+                   for i, _ in self.tiles.buckets.get(key, ())]
+        indices.sort()
+        return indices
+
+
+    def gap(self, p, u, v, h):
+        """Distance from p to the edge of the block of tiles within h of (u, v), inf if the block covers every seed."""
+        if u - h <= 0 and v - h <= 0 and u + h >= self.max_u and v + h >= self.max_v:
+            return math.inf
+        size, min_x, min_y = self.tiles.size, self.tiles.min_x, self.tiles.min_y
+        return min(p[0] - (min_x + (u - h) * size), min_x + (u + h + 1) * size - p[0],
+                   p[1] - (min_y + (v - h) * size), min_y + (v + h + 1) * size - p[1])
+
+
+    def tile_cell(self, p, bounding_region, u, v, candidates):
+        """
+        Cell of p in tile (u, v), clipped against the candidates nearest first.
+
+        Clipping stops at the first candidate further than twice the cell's
+        radius, as in GridVoronoiGenerator. When the candidates run out first,
+        the halo grows until the security radius check passes, clipping only
+        against the seeds of the new tiles.
+        """
+        h = self.halo
+        cell = bounding_region[:]
+        visited = set(candidates)
+        while True:
+            radius = max((math.dist(p, vertex) for vertex in cell), default=0)
+            seeds = self.seeds[candidates]
+            distances = np.hypot(seeds[:, 0] - p[0], seeds[:, 1] - p[1])
+            order = np.argsort(distances, kind="stable")
+            for distance, q in zip(distances[order].tolist(), map(tuple, seeds[order].tolist())):
+                # security radius: no further seed's bisector reaches the cell
+                if distance > 2 * radius:
+                    return cell
+                if p == q:
+                    continue
+                cell = super().compute_voronoi_cell(p, cell, [q])
+                if not cell:
+                    return cell
+                radius = max(math.dist(p, vertex) for vertex in cell)
+            if 2 * radius < self.gap(p, u, v, h):
+                return cell
+            h += 1
+            # only the new ring of tiles, clipping against a seed twice adds noise vertices
+            candidates = [i for i in self.candidates(u, v, h) if i not in visited]
+            visited.update(candidates)
+
 
+    def compute_voronoi_cell(self, p, bounding_region, neighbours=None):
+        """Compute the Voronoi cell for a given point from the seeds in its tile and halo."""
+        if neighbours is not None:
+            return super().compute_voronoi_cell(p, bounding_region, neighbours)
+        u, v = self.tiles.bucket(p)
+        return self.tile_cell(p, bounding_region, u, v, self.candidates(u, v, self.halo))
 
-    def remove_duplicate_vertices(self, cell):
-        """Remove duplicate or near-identical vertices."""
-        cleaned_cell = []
-        for v in cell:
-            rounded_v = (round(v[0], 2), round(v[1], 2))
-            if rounded_v not in cleaned_cell:
-                cleaned_cell.append(rounded_v)
-        return cleaned_cell
 
+    def iter_tiles(self, bounding_region=None):
+        """Yield (tile, cells) for every tile in row order, cells being a {seed: cell} dict of the tile's seeds."""
+        if bounding_region is None:
+            bounding_region = self.compute_bounding_region()
 
-    def dictionary_to_list(self, cells_dict):
-        """Convert dictionary format into a list of vertex sets."""
-        return [
-            [tuple(vertex) for vertex in self.remove_duplicate_vertices(vertices)]
-            for vertices in cells_dict.values()
-        ]
+        lazy = self.uses_lazy_cell(bounding_region)
+        for u, v in sorted(self.tiles.buckets, key=lambda key: (key[1], key[0])):
+            candidates = self.candidates(u, v, self.halo)
+            cells = {}
+            for _, p in self.tiles.buckets[(u, v)]:
+                compute = lambda region: self.tile_cell(p, region, u, v, candidates)
+                cells[p] = self.lazy_cell(p, bounding_region, compute) if lazy else compute(bounding_region)
+            yield (u, v), cells
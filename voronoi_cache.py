@@ -0,0 +1,175 @@
+import hashlib
+import inspect
+import os
+import pickle
+from collections import OrderedDict
+from voronoi_cells import generate_voronoi_cells
+from voronoi_to_delauney import run_delauney
+
+
+# distributions whose output depends on the rng, only cacheable with an explicit seed
+RANDOM_DISTRIBUTIONS = ("random", "poisson")
+
+# parameters that change how a result is computed but not the result itself
+IGNORED_PARAMETERS = ("workers", "metrics")
+
+
+class ResultCache:
+    """
+    Memoizing cache for generate_voronoi_cells and run_delauney.
+
+    Results are keyed on a hash of the call's parameters (with defaults filled
+    in) and kept in a bounded in-memory LRU. With a directory, results are also
+    pickled to disk, where the least recently used files are evicted once the
+    directory grows past max_disk_bytes. random and poisson seeds are only
+    cached when an rng seed is given.
+
+    Cached results are shared between callers, so don't modify them in place.
+    """
+
+    def __init__(self, max_entries=32, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.uncached = 0  # calls that could not be cached (random distribution without a seed)
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+
+    def key(self, name, *parts):
+        """Hex digest identifying a call to `name` with the given parameters."""
+        digest = hashlib.sha256(name.encode())
+        for part in parts:
+            digest.update(pickle.dumps(part, protocol=4))
+        return digest.hexdigest()
+
+
+    def path(self, key):
+        """File holding the disk entry for key."""
+        return os.path.join(self.directory, key + ".pkl")
+
+
+    def get(self, key):
+        """Return (found, value), looking in memory first and then on disk."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return True, self.memory[key]
+
+        if self.directory is not None:
+            try:
+                with open(self.path(key), "rb") as file:
+                    value = pickle.load(file)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                try:
+                    os.utime(self.path(key))  # mark as recently used for eviction
+                except OSError:
+                    pass  # evicted or deleted since it was read, the value is still good
+                self.hits += 1
+                self.disk_hits += 1
+                self.remember(key, value)
+                return True, value
+
+        self.misses += 1
+        return False, None
+
+
+    def remember(self, key, value):
+        """Store value in the memory tier, dropping the least recently used entries."""
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+
+    def put(self, key, value):
+        """Store value in memory and, if enabled, on disk."""
+        self.remember(key, value)
+        if self.directory is None:
+            return
+
+        # write to a temporary file first so a reader never sees a partial entry
+        temporary = self.path(key) + ".tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path(key))
+        self.evict_disk()
+
+
+    def evict_disk(self):
+        """Delete the least recently used disk entries until the directory fits in max_disk_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                try:
+                    status = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue  # removed by another process since listdir
+                entries.append((status.st_mtime, status.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+
+    def cached(self, key, function, *args, **kwargs):
+        """Return the cached result for key, calling function(*args, **kwargs) on a miss."""
+        found, value = self.get(key)
+        if not found:
+            value = function(*args, **kwargs)
+            self.put(key, value)
+        return value
+
+
+    def generate_voronoi_cells(self, *args, **kwargs):
+        """Cached generate_voronoi_cells, same parameters and result."""
+        bound = inspect.signature(generate_voronoi_cells).bind(*args, **kwargs)
+        bound.apply_defaults()
+        parameters = {name: value for name, value in bound.arguments.items() if name not in IGNORED_PARAMETERS}
+
+        if parameters["distribution_method"] in RANDOM_DISTRIBUTIONS and parameters["seed"] is None:
+            self.uncached += 1
+            return generate_voronoi_cells(*args, **kwargs)
+
+        key = self.key("generate_voronoi_cells", sorted(parameters.items()))
+        return self.cached(key, generate_voronoi_cells, *args, **kwargs)
+
+
+    def run_delauney(self, voronoi_data, seed_points):
+        """Cached run_delauney, keyed on the cells and seed points themselves."""
+        key = self.key("run_delauney", voronoi_data, seed_points)
+        return self.cached(key, run_delauney, voronoi_data, seed_points)
+
+
+    def stats(self):
+        """Hit and miss counters, as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+        }
+
+
+    def clear(self):
+        """Empty both tiers (counters are kept)."""
+        self.memory.clear()
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
@@ -1,7 +1,40 @@
 from distributions import PointGenerator
-from voronoi_algorithm import VoronoiGenerator
+from voronoi_algorithm import VoronoiGenerator, NumpyVoronoiGenerator, FortuneVoronoiGenerator, GridVoronoiGenerator, TiledVoronoiGenerator
+from voronoi_diagram import VertexWelder
+from delauney_algorithm import DelauneyVoronoiGenerator, DynamicVoronoi
+from metrics import phase
 
-def generate_voronoi_cells(x_range, y_range, num_points, offset_x=0, offset_y=0, distribution_method="halton", bounding_shape="rectangle", custom_shape=None):
+
+# Voronoi engines by the name generate_voronoi_cells takes
+ENGINES = {
+    "clip": VoronoiGenerator,
+    "numpy": NumpyVoronoiGenerator,
+    "fortune": FortuneVoronoiGenerator,
+    "grid": GridVoronoiGenerator,
+    "delauney": DelauneyVoronoiGenerator,
+    "tiled": TiledVoronoiGenerator
+}
+
+
+def generate_seed_points(x_range, y_range, num_points, offset_x=0, offset_y=0, distribution_method="halton", seed=None):
+    """Generate seed points with the given distribution method (see generate_voronoi_cells)."""
+
+    # Instantiate the PointGenerator with specified parameters
+    point_generator = PointGenerator(x_range, y_range, num_points, offset_x, offset_y, seed=seed)
+
+    # Choose a distribution method
+    distributions = {
+        "halton": point_generator.halton_samples,
+        "fibonacci": point_generator.fibonacci_spiral,
+        "fibonacci_segments": point_generator.fibonacci_spiral_segments,
+        "poisson": point_generator.poisson_disk_samples,
+        "random": point_generator.random_distribution
+    }
+    
+    return distributions.get(distribution_method, distributions[distribution_method])()
+
+
+def generate_voronoi_cells(x_range, y_range, num_points, offset_x=0, offset_y=0, distribution_method="halton", bounding_shape="rectangle", custom_shape=None, engine="clip", workers=None, relax_iterations=0, relax_tol=0.01, seed=None, metrics=None, lazy_boundary=False):
     """
     Generate Voronoi cells using a specified point distribution method and bounding shape.
 
@@ -16,6 +49,23 @@ def generate_voronoi_cells(x_range, y_range, num_points, offset_x=0, offset_y=0,
         bounding_shape (str, optional): Type of bounding shape.
             Options: "rectangle", "circle", "triangle", "custom". Default is "rectangle".
         custom_shape (list, optional): List of (x, y) tuples for a custom bounding shape.
+        engine (str, optional): Algorithm used to compute the cells.
+            Options: "clip" (one polygon clip per seed pair), "numpy" (array based clipping),
+            "fortune" (sweep line, clips each cell against its Delaunay neighbours only),
+            "grid" (nearest seeds first with an early exit),
+            "delauney" (Bowyer-Watson triangulation and its dual),
+            "tiled" (seeds of the surrounding tiles only, see stream_voronoi_cells). Default is "clip".
+        workers (int, optional): Number of worker processes used to compute the cells. Default is None (single process).
+        relax_iterations (int, optional): Lloyd relaxation iterations applied to the seeds. The relaxed cells
+            come from DynamicVoronoi inside the bounding region of the original seeds, and engine and workers
+            are not used. Default is 0 (no relaxation).
+        relax_tol (float, optional): Relaxation stops once no seed moves further than this. Default is 0.01.
+        seed (int, optional): Seed for the "random" and "poisson" distributions. Default is None (fresh entropy).
+        metrics (Metrics, optional): Collects phase times ("points", "cells", "format"), clip and cell
+            counts. Read it, dump it with metrics.to_json or give it a callback. Default is None (off).
+        lazy_boundary (bool, optional): Clip every cell from a small box around its seed first and only the
+            cells near the edge from the bounding region, which saves most of the work for "circle" and
+            convex "custom" shapes with many vertices. Non-convex shapes are always clipped directly. Default is False.
     
     Returns:
         tuple: (voronoi_cells, seed_points) where:
@@ -23,24 +73,75 @@ def generate_voronoi_cells(x_range, y_range, num_points, offset_x=0, offset_y=0,
             seed_points is the list of seed points used for generation.
     """
 
-    # Instantiate the PointGenerator with specified parameters
-    point_generator = PointGenerator(x_range, y_range, num_points, offset_x, offset_y)
+    with phase(metrics, "points"):
+        seed_points = generate_seed_points(x_range, y_range, num_points, offset_x, offset_y, distribution_method, seed)
 
-    # Choose a distribution method
-    distributions = {
-        "halton": point_generator.halton_samples,
-        "fibonacci": point_generator.fibonacci_spiral,
-        "fibonacci_segments": point_generator.fibonacci_spiral_segments,
-        "poisson": point_generator.poisson_disk_samples,
-        "random": point_generator.random_distribution
-    }
-    
-    seed_points = distributions.get(distribution_method, distributions[distribution_method])()
+    if relax_iterations:
+        with phase(metrics, "cells"):
+            voronoi = DynamicVoronoi(seed_points, bounding_shape=bounding_shape, custom_shape=custom_shape)
+            voronoi.lazy_boundary = lazy_boundary
+        with phase(metrics, "relax"):
+            voronoi.relax(relax_iterations, relax_tol)
+        with phase(metrics, "format"):
+            return voronoi.dictionary_to_list(voronoi.voronoi_cells()), list(voronoi.vertex_ids)
 
-    # Instantiate VoronoiGenerator with selected bounding shape
-    voronoi = VoronoiGenerator(seed_points, bounding_shape=bounding_shape, custom_shape=custom_shape)
+    # Instantiate the Voronoi engine with selected bounding shape
+    voronoi = ENGINES[engine](seed_points, bounding_shape=bounding_shape, custom_shape=custom_shape)
+    voronoi.lazy_boundary = lazy_boundary
+    if metrics is not None:
+        metrics.instrument(voronoi)
+
+    with phase(metrics, "cells"):
+        cells_dict = voronoi.voronoi_cells(workers=workers)
 
     # Convert dictionary format to list of vertices
-    formatted_cells = voronoi.dictionary_to_list(voronoi.voronoi_cells()) 
+    with phase(metrics, "format"):
+        formatted_cells = voronoi.dictionary_to_list(cells_dict)
+
+    return formatted_cells, seed_points
+
+
+def generate_voronoi_and_delauney(x_range, y_range, num_points, offset_x=0, offset_y=0, distribution_method="halton", bounding_shape="rectangle", custom_shape=None, seed=None):
+    """
+    Generate Voronoi cells and the delauney triangulation in one pass, straight from the seed points.
+
+    Parameters are as for generate_voronoi_cells.
+
+    Returns:
+        tuple: (voronoi_cells, seed_points, delauney_triangles) where:
+            voronoi_cells is a list of Voronoi cell vertex sets.
+            seed_points is the list of seed points used for generation.
+            delauney_triangles is a list of triangles, each a list of three seed points (as run_delauney returns).
+    """
+    seed_points = generate_seed_points(x_range, y_range, num_points, offset_x, offset_y, distribution_method, seed)
+
+    voronoi = DelauneyVoronoiGenerator(seed_points, bounding_shape=bounding_shape, custom_shape=custom_shape)
+    formatted_cells = voronoi.dictionary_to_list(voronoi.voronoi_cells())
+
+    return formatted_cells, seed_points, voronoi.delauney_triangles()
+
+
+def stream_voronoi_cells(x_range, y_range, num_points, offset_x=0, offset_y=0, distribution_method="halton", bounding_shape="rectangle", custom_shape=None, seeds_per_tile=64, seed=None, lazy_boundary=False):
+    """
+    Generate Voronoi cells tile by tile, holding one tile of cells in memory at a time.
+
+    Only the cells are streamed: all num_points seeds are generated up front and
+    kept, with the tile grid over them, so memory is still O(num_points).
+
+    Parameters are as for generate_voronoi_cells, plus:
+        seeds_per_tile (int, optional): Average number of seeds per tile. Default is 64.
+        lazy_boundary (bool, optional): As for generate_voronoi_cells. Default is False.
+
+    Yields:
+        tuple: (voronoi_cells, seed_points) for each tile, in the format of generate_voronoi_cells.
+            Together the tiles hold the same cells as generate_voronoi_cells returns.
+    """
+    seed_points = generate_seed_points(x_range, y_range, num_points, offset_x, offset_y, distribution_method, seed)
+
+    voronoi = TiledVoronoiGenerator(seed_points, bounding_shape=bounding_shape, custom_shape=custom_shape, seeds_per_tile=seeds_per_tile)
+    voronoi.lazy_boundary = lazy_boundary
 
-    return formatted_cells, seed_points
\ No newline at end of file
+    # one welder for every tile, so a vertex shared across a tile edge comes out the same in both
+    welder = VertexWelder()
+    for _, cells in voronoi.iter_tiles():
+        yield voronoi.dictionary_to_list(cells, welder), list(cells)
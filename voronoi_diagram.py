@@ -0,0 +1,306 @@
+import math
+import os
+from array import array
+import numpy as np
+
+
+# arrays written by VoronoiDiagram.save, one .npy file each
+DIAGRAM_ARRAYS = ("seeds", "vertices", "cell_offsets", "cell_vertices", "seed_index",
+                  "triangles", "neighbour_offsets", "neighbours")
+
+
+def polygon_centroids(vertices, offsets):
+    """
+    Area centroids of many polygons at once.
+
+    vertices is an (E, 2) array of all polygon vertices back to back and polygon i
+    uses vertices[offsets[i]:offsets[i + 1]]. Polygons with no area get the mean
+    of their vertices, empty ones get nan.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    starts, counts = offsets[:-1], np.diff(offsets)
+    centroids = np.full((len(counts), 2), np.nan)
+    filled = counts > 0
+    if not filled.any():
+        return centroids
+
+    # index of the next vertex, wrapping at the end of each polygon
+    following = np.arange(1, len(vertices) + 1)
+    following[offsets[1:][filled] - 1] = starts[filled]
+    x, y = vertices[:, 0], vertices[:, 1]
+    next_x, next_y = x[following], y[following]
+    cross = x * next_y - next_x * y
+
+    # shoelace sums per polygon, reduceat over the non empty polygons only
+    segments = starts[filled]
+    area = np.add.reduceat(cross, segments)
+    moment_x = np.add.reduceat((x + next_x) * cross, segments)
+    moment_y = np.add.reduceat((y + next_y) * cross, segments)
+    mean = np.add.reduceat(vertices, segments) / counts[filled, None]
+
+    flat = np.abs(area) < 1e-12
+    area = np.where(flat, 1.0, area)
+    centroids[filled] = np.where(flat[:, None], mean, np.column_stack((moment_x, moment_y)) / (3 * area[:, None]))
+    return centroids
+
+
+def canonical_start(cell):
+    """Index of a cell's lowest (then leftmost) vertex, where dictionary_to_list starts every cell."""
+    return min(range(len(cell)), key=lambda i: (cell[i][1], cell[i][0])) if cell else 0
+
+
+class VertexWelder:
+    """
+    Gives every distinct vertex of a set of cells one shared integer id.
+
+    Vertices that round to the same point (to `decimals` places) are one
+    vertex, as remove_duplicate_vertices always had it, and so are vertices
+    within tolerance of each other that round apart, like two copies of a
+    corner on either side of a rounding boundary computed by neighbouring
+    cells. Neighbouring cells therefore get the very same vertex for every
+    corner they share.
+
+    Two vertices can only round apart within tolerance if both lie within
+    tolerance of a rounding boundary, so only those vertices are hashed on a
+    snapping grid of 2 * tolerance sized squares, where a new one is compared
+    with its own square and the three neighbouring squares on its nearer
+    sides. Everything else is a single dict lookup: O(total vertices) overall.
+
+    vertices holds the output coordinates of every id, the first welded copy
+    rounded to `decimals` places.
+    """
+
+    def __init__(self, tolerance=1e-6, decimals=2):
+        self.tolerance = tolerance
+        self.decimals = decimals
+        self.scale = 10.0 ** decimals
+        self.size = 2 * tolerance
+        self.margin = tolerance * self.scale  # tolerance in units of the rounding step
+        self.rounded = {}   # rounded (x, y) -> id, every rounding seen so far
+        self.buckets = {}   # grid square -> (x, y, id) of the vertices near a rounding boundary in it
+        self.vertices = []  # rounded (x, y) tuple of every id
+
+
+    def weld(self, x, y):
+        """Id of the vertex (x, y), a new one unless an earlier vertex rounds the same or is within tolerance."""
+        fx, fy = x * self.scale, y * self.scale
+        if abs(fx - math.floor(fx) - 0.5) > self.margin and abs(fy - math.floor(fy) - 0.5) > self.margin:
+            return self.rounded_id(x, y)
+        return self.nearby(x, y)
+
+
+    def rounded_id(self, x, y):
+        """Id of the rounding of (x, y), a new id with those output coordinates the first time it is seen."""
+        key = (round(x, self.decimals), round(y, self.decimals))
+        v = self.rounded.get(key)
+        if v is None:
+            v = self.rounded[key] = len(self.vertices)
+            self.vertices.append(key)
+        return v
+
+
+    def nearby(self, x, y):
+        """
+        Id of (x, y) near a rounding boundary: that of an earlier such vertex within tolerance, else its rounded id.
+
+        Only the vertex (x, y) itself takes the earlier id. Its rounding keeps its
+        own id and it is not added to the buckets, so other vertices that round
+        the same, or are within tolerance of (x, y) only, never inherit it.
+        """
+        gx, gy = x / self.size, y / self.size
+        column, row = math.floor(gx), math.floor(gy)
+        # the tolerance disc around (x, y) only reaches the neighbouring square on the nearer side
+        other_column = column - 1 if gx - column < 0.5 else column + 1
+        other_row = row - 1 if gy - row < 0.5 else row + 1
+
+        tolerance = self.tolerance * self.tolerance
+        for square in ((column, row), (other_column, row), (column, other_row), (other_column, other_row)):
+            for px, py, u in self.buckets.get(square, ()):
+                if (px - x) * (px - x) + (py - y) * (py - y) <= tolerance:
+                    return u
+
+        v = self.rounded_id(x, y)
+        self.buckets.setdefault((column, row), []).append((x, y, v))
+        return v
+
+
+    def weld_cell(self, cell):
+        """Ids of a cell's vertices in order, with duplicate or near-identical vertices dropped."""
+        # weld inlined, this runs for every vertex of every cell
+        rounded, decimals, scale, margin, floor = self.rounded, self.decimals, self.scale, self.margin, math.floor
+        ids, seen = [], set()
+        for x, y in cell:
+            fx, fy = x * scale, y * scale
+            if abs(fx - floor(fx) - 0.5) > margin and abs(fy - floor(fy) - 0.5) > margin:
+                v = rounded.get((round(x, decimals), round(y, decimals)))
+                if v is None:
+                    v = self.rounded_id(x, y)
+            else:
+                v = self.nearby(x, y)
+            if v not in seen:
+                seen.add(v)
+                ids.append(v)
+        return ids
+
+
+class VoronoiDiagram:
+    """
+    Compact array representation of a Voronoi diagram.
+
+    - vertices: (V, 2) float64 array, a vertex shared by neighbouring cells is stored once
+    - cell_offsets: (N + 1,) int64 array, cell i uses cell_vertices[cell_offsets[i]:cell_offsets[i + 1]]
+    - cell_vertices: (E,) int64 array of indices into vertices, in polygon order
+    - seeds: (S, 2) float64 array of seed points
+    - seed_index: (N,) int64 array, the seed row of each cell
+
+    Once set_delauney has been called the delauney side is held the same way:
+
+    - triangles: (M, 3) int64 array of seed rows, counter-clockwise
+    - neighbour_offsets: (S + 1,) int64 array, seed i's delauney neighbours are
+      neighbours[neighbour_offsets[i]:neighbour_offsets[i + 1]]
+    - neighbours: (2 * edges,) int64 array of seed rows, sorted per seed
+    """
+
+    def __init__(self, seeds, vertices, cell_offsets, cell_vertices, seed_index=None,
+                 triangles=None, neighbour_offsets=None, neighbours=None):
+        self.seeds = np.asarray(seeds, dtype=np.float64).reshape(-1, 2)
+        self.vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        self.cell_offsets = np.asarray(cell_offsets, dtype=np.int64)
+        self.cell_vertices = np.asarray(cell_vertices, dtype=np.int64)
+        if seed_index is None:
+            seed_index = np.arange(len(self.cell_offsets) - 1)
+        self.seed_index = np.asarray(seed_index, dtype=np.int64)
+        self.triangles = triangles
+        self.neighbour_offsets = neighbour_offsets
+        self.neighbours = neighbours
+
+
+    @classmethod
+    def from_cells(cls, cells, seeds, seed_index=None, decimals=2, tolerance=None):
+        """
+        Build a diagram from an iterable of cells (lists of (x, y) vertices).
+
+        Vertices are welded with a VertexWelder, so vertices that round to the
+        same point or lie within tolerance of each other share one index, stored
+        rounded to `decimals` places as dictionary_to_list does. Each cell is
+        rotated to start at its lowest vertex like dictionary_to_list, so
+        to_list gives back its output. `cells` can be a generator so no per
+        cell lists are kept.
+        """
+        welder = VertexWelder(decimals=decimals) if tolerance is None else VertexWelder(tolerance, decimals)
+        offsets, indices = array("q", [0]), array("q")
+        for cell in cells:
+            ids = welder.weld_cell(cell)
+            start = canonical_start([welder.vertices[v] for v in ids])
+            indices.extend(ids[start:])
+            indices.extend(ids[:start])
+            offsets.append(len(indices))
+
+        vertices = np.array(welder.vertices, dtype=np.float64).reshape(-1, 2)
+        return cls(seeds, vertices, np.frombuffer(offsets, dtype=np.int64),
+                   np.frombuffer(indices, dtype=np.int64), seed_index)
+
+
+    @classmethod
+    def from_cells_dict(cls, cells_dict, decimals=2, tolerance=None):
+        """Build a diagram from the {seed: cell} dict returned by VoronoiGenerator.voronoi_cells."""
+        return cls.from_cells(cells_dict.values(), list(cells_dict), decimals=decimals, tolerance=tolerance)
+
+
+    def set_delauney(self, triangles):
+        """
+        Attach the delauney triangulation and derive the neighbour lists from it.
+
+        triangles is either an (M, 3) array of seed rows or a list of triangles of
+        three seed points, the format returned by run_delauney.
+        """
+        if len(triangles) and not np.isscalar(triangles[0][0]):
+            rows = {}
+            for i, p in enumerate(self.seeds.tolist()):
+                rows.setdefault(tuple(p), i)
+            triangles = [[rows[(float(p[0]), float(p[1]))] for p in triangle] for triangle in triangles]
+        self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+        # every triangle edge in both directions, deduplicated and grouped by seed
+        edges = self.triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        edges = np.unique(np.concatenate((edges, edges[:, ::-1])), axis=0)
+        self.neighbours = edges[:, 1].copy()
+        self.neighbour_offsets = np.zeros(len(self.seeds) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges[:, 0], minlength=len(self.seeds)), out=self.neighbour_offsets[1:])
+        return self
+
+
+    def seed_neighbours(self, i):
+        """Seed rows of the delauney neighbours of seed i."""
+        return self.neighbours[self.neighbour_offsets[i]:self.neighbour_offsets[i + 1]]
+
+
+    def save(self, directory):
+        """
+        Write every array to its own .npy file in directory.
+
+        Plain .npy files (unlike .npz archives) can be memory mapped by load.
+        The file of an array that is None is removed, so load never mixes in
+        arrays left by a diagram saved to the directory before.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in DIAGRAM_ARRAYS:
+            value = getattr(self, name)
+            path = os.path.join(directory, name + ".npy")
+            if value is not None:
+                np.save(path, np.ascontiguousarray(value))
+            elif os.path.exists(path):
+                os.remove(path)
+
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        """
+        Load a diagram written by save.
+
+        With the default mmap_mode="r" the arrays are read only views of the files,
+        so loading does not copy any data, and worker processes that load the same
+        directory share the pages through the OS cache. Pass mmap_mode=None to read
+        the arrays into memory instead.
+        """
+        arrays = {}
+        for name in DIAGRAM_ARRAYS:
+            path = os.path.join(directory, name + ".npy")
+            if os.path.exists(path):
+                arrays[name] = np.load(path, mmap_mode=mmap_mode)
+
+        return cls(**arrays)
+
+
+    def __len__(self):
+        return len(self.cell_offsets) - 1
+
+
+    def cell(self, i):
+        """(k, 2) vertex array of cell i."""
+        return self.vertices[self.cell_vertices[self.cell_offsets[i]:self.cell_offsets[i + 1]]]
+
+
+    def cell_seeds(self):
+        """(N, 2) array of the seed point of every cell."""
+        return self.seeds[self.seed_index]
+
+
+    def centroids(self):
+        """(N, 2) array of the area centroid of every cell."""
+        return polygon_centroids(self.vertices[self.cell_vertices], self.cell_offsets)
+
+
+    def to_list(self):
+        """Cells as lists of (x, y) tuples, the format dictionary_to_list and the plotting code use."""
+        vertices = [tuple(v) for v in self.vertices.tolist()]
+        offsets = self.cell_offsets.tolist()
+        indices = self.cell_vertices.tolist()
+        return [[vertices[v] for v in indices[offsets[i]:offsets[i + 1]]] for i in range(len(self))]
+
+
+    @property
+    def nbytes(self):
+        """Total size of the diagram arrays in bytes."""
+        return sum(getattr(self, name).nbytes for name in DIAGRAM_ARRAYS if getattr(self, name) is not None)
@@ -1,6 +1,6 @@
-from math import ceil, sqrt
-from numpy import zeros, empty
-from collections import OrderedDict
+from math import ceil, sqrt, atan2
+from numpy import zeros, empty, array
+from metrics import phase
 
 
 # calculate the delauney triangulation of a dataset given the voronoi cells
@@ -103,7 +103,9 @@ class cell_conversion:
         use return_delauney() to return a list of plottable triangles 
         
         """
-    def __init__(self, voronoi_cells, quadrants, seed_points):
+    def __init__(self, voronoi_cells, quadrants, seed_points, metrics=None):
+        # quadrants may be None, they are only used to sort cells for plotting
+        self.metrics = metrics
         self.seed_points = seed_points
         self.cell_number = [n for n in range(len(voronoi_cells))]
         self.cells = voronoi_cells
@@ -112,8 +114,10 @@ class cell_conversion:
         self.quadrants = quadrants
         
         #calculate delauney triangles on class initialisation
-        self.calculate_properties()
-        self.calculate_delauney()
+        with phase(metrics, "properties"):
+            self.calculate_properties()
+        with phase(metrics, "neighbours"):
+            self.calculate_delauney()
     
     
     # return seed point co-ords of nth voronoi cell (x,y) 
@@ -137,10 +141,11 @@ class cell_conversion:
         y_max = y_coords[-1]
         y_min = y_coords[0]
         
-        #loop through cells
+        #loop through cells (quadrants are only filled in for plotting, neighbours no longer need them)
         for i in self.cell_number:
             self.calculate_non_boundary_edges(i, x_max, x_min, y_max, y_min)
-            self.calculate_voronoi_quadrant(i, self.quadrants)
+            if self.quadrants is not None:
+                self.calculate_voronoi_quadrant(i, self.quadrants)
             
     
     # determine how many edges cell, i, shares with other cells, not including the bounding quadrilateral (defined by x_max, x_min, y_max, y_min)
@@ -221,117 +226,94 @@ class cell_conversion:
     # map the set of voronoi cells to an equivalent set of delauney triangles by finding and connecting the seed points of neighbouring voronoi cells
     def calculate_delauney(self):
 
-        # loop over all voronoi cells
-        for cols in self.quadrants:    
-            for q in cols:
-                for i in q.contained_cells:
-                    
-                    #define edges of voronoi cell as a pair of vertices
-                    #to match edges with neighbouring cells
-                    for j in range(0,len(self.cells[i])):
-                        vertex1=self.cells[i][j]
-                        if j<len(self.cells[i])-1:
-                            vertex2 = self.cells[i][j+1]
-                        elif j == len(self.cells[i])-1:
-                            vertex2 = self.cells[i][0]
+        # index every voronoi cell edge by its unordered pair of vertices,
+        # any edge seen in two cells means those cells are neighbours
+        edges = {}
+        for i in self.cell_number:
+            cell = self.cells[i]
+            for j in range(len(cell)):
+                vertex1, vertex2 = cell[j], cell[(j + 1) % len(cell)]
+                key = (vertex1, vertex2) if vertex1 <= vertex2 else (vertex2, vertex1)
+                edges.setdefault(key, []).append(i)
 
-                        #loop over the neighbouring quadrants (including quadrant which contains cell "i")
-                        loop_quadrants = [q.position]+q.neighbours
-                        
-                        for (x,y) in loop_quadrants:
-                            quadrant = self.quadrants[x][y]
-                            
-                            if self.cell_unmatched_edges[i] == 0:
-                                break                              
-                            
-                            for c in quadrant.contained_cells:
-                                #avoid comparing voronoi cell to itself
-                                if i == c:
-                                    pass
-                                #avoid comparing voronoi cell to existing neighbours
-                                elif i in (self.cell_neighbours[c]):
-                                    pass
-                                else:
-                                    #scan neighbour's vertices to look for a match
-                                    for s in range(0,len(self.cells[c])):
-                                        nvertex1=self.cells[c][s]
-                                        if s<len(self.cells[c])-1:
-                                            nvertex2 = self.cells[c][s+1]
-                                        elif s == len(self.cells[c])-1:
-                                            nvertex2 = self.cells[c][0]
+        for cells in edges.values():
+            for a in range(len(cells)):
+                for b in range(a + 1, len(cells)):
+                    i, c = cells[a], cells[b]
+                    #avoid comparing voronoi cell to itself and to existing neighbours
+                    if i == c or c in self.cell_neighbours[i]:
+                        continue
 
-                                        #on match update info for both cells i and c
-                                        if ((vertex1 == nvertex1 and vertex2 == nvertex2) or
-                                            (vertex1 == nvertex2 and vertex2 == nvertex1)):
+                    #update class info for both matches
+                    self.cell_neighbours[i].append(c)
+                    self.cell_neighbours[c].append(i)
+                    self.cell_unmatched_edges[i] -= 1
+                    self.cell_unmatched_edges[c] -= 1
 
-                                            #update class info for both matches
-                                            self.cell_neighbours[i].append(c)
-                                            self.cell_neighbours[c].append(i)
-                                            self.cell_unmatched_edges[i]-=1
-                                            self.cell_unmatched_edges[c]-=1
-                                            
-                                            #nothing more to be found between these two 
-                                            break
-                                        else:
-                                            pass
+        #every pair of cells sharing an edge key is compared once
+        if self.metrics is not None:
+            self.metrics.count("edges_indexed", len(edges))
+            self.metrics.count("edge_comparisons", sum(len(cells) * (len(cells) - 1) // 2 for cells in edges.values()))
+            self.metrics.per_cell["unmatched_edges"] = list(self.cell_unmatched_edges)
+            self.metrics.count("unmatched_edges", sum(self.cell_unmatched_edges))
                 
                 
+    #yields each delauney triangle once as a (i, j, k) triple of cell numbers.
+    #neighbours of cell i are sorted by angle around its seed point, so every triangle around i
+    #is a pair of consecutive neighbours; it is emitted from its lowest numbered cell only
+    def iter_delauney_triangles(self):
+        for i in self.cell_number:
+            x, y = self.seed_points[i]
+            ring = sorted(self.cell_neighbours[i],
+                          key=lambda n: atan2(self.seed_points[n][1] - y, self.seed_points[n][0] - x))
+            for a in range(len(ring)):
+                j, k = ring[a], ring[(a + 1) % len(ring)]
+                if i < j and i < k and j != k and k in self.cell_neighbours[j]:
+                    #consecutive neighbours must turn counter-clockwise (less than half a turn) around i
+                    (xj, yj), (xk, yk) = self.seed_points[j], self.seed_points[k]
+                    if (xj - x) * (yk - y) - (yj - y) * (xk - x) > 0:
+                        yield i, j, k
+
+
+    #delauney triangles as an (M, 3) array of cell numbers
+    def delauney_indices(self):
+        return array(list(self.iter_delauney_triangles()), dtype=int).reshape(-1, 3)
+
+
+    #yields plottable triangles one at a time, for callers that stream rather than build the full list
+    def iter_delauney_points(self):
+        for i, j, k in self.iter_delauney_triangles():
+            yield [self.seed_points[i], self.seed_points[j], self.seed_points[k]]
+
+
     #converts list of cell neighbours into plottable co-ordinates representing
     #triangular seedpoint joins between neighbouring voronoi cells
     def return_delauney_points(self):
-        neighbours = self.cell_neighbours.copy()
-        delauney_set = []
-        seen_triangles = OrderedDict() # maintains insertion order
-    
-        # find sets of 3 neighbouring cells
-        for i in range(len(neighbours)):
-            matches = []
-            cell_neighbours = neighbours[i]
-    
-            for j in cell_neighbours:
-                if i != j:
-                    for k in neighbours[j]:
-                        if i != k:
-                            for l in neighbours[k]:
-                                if i == l:
-                                    triangle = tuple(sorted((i, j, k)))
-                                    if triangle not in seen_triangles:
-                                        seen_triangles[triangle] = True
-                                        matches.append(triangle)
-                    
-            delauney_set.extend(matches) # preserve loop order
-    
-        # replace the numbers in delauney_set with the seedpoints of these cells
-        for i, elements in enumerate(delauney_set):
-            v1, v2, v3 = elements
-            delauney_set[i] = [self.seed_points[v1], self.seed_points[v2], self.seed_points[v3]]
-    
-        return delauney_set
+        return list(self.iter_delauney_points())
     
 
 
-def run_delauney(voronoi_data, seed_points):
+#metrics (a Metrics, optional) collects phase times, edge comparisons, unmatched edges per cell and triangles found
+def run_delauney(voronoi_data, seed_points, metrics=None):
     
-    quadrants = generate_quadrants(voronoi_data)
+    with phase(metrics, "quadrants"):
+        quadrants = generate_quadrants(voronoi_data)
     
     #calculate voronoi cell properties (their quadrant and number of non-boundary cell edges)
-    conversion = cell_conversion(voronoi_data, quadrants, seed_points)
+    conversion = cell_conversion(voronoi_data, quadrants, seed_points, metrics)
     
     #calculate delauney triangles
-    delauney_triangles = conversion.return_delauney_points()
-    
-    #i think the quadrants generate fine
-    
-    #i think the sorting of points into quadrants is wrong?
+    with phase(metrics, "triangles"):
+        delauney_triangles = conversion.return_delauney_points()
+    if metrics is not None:
+        metrics.count("triangles", len(delauney_triangles))
     
     return quadrants, delauney_triangles
 
 
-#TODO: there is a small bug that occurs when running the halton distribution at 250 points
-# if you plot the quadrants and the delauney cells you can see a gap appears 
-# which is because the neighbour cells don't fall in neighbouring quadrants. 
-# could fix this by making the quadrants bigger (which would slow down the program)
-# OR by extending the search to look at further quadrants if we don't find matches
+#NOTE: halton at 250 points used to leave a gap because neighbour cells didn't fall in
+# neighbouring quadrants. neighbours are now found through the shared edge index, so the
+# quadrants no longer limit the search
 
 #TODO: also a strange gap caused by fibonacci segments with n=3. not sure why but doesn't 
 #matter too much :)